@@ -0,0 +1,168 @@
+# ----------------------------------------------------------------------------------------------------- #
+# This log_handlers.py file contains project-level logging handlers referenced from settings.LOGGING:   #
+#                                                                                                       #
+# Purpose:                                                                                              #
+# The stdlib RotatingFileHandler writes and flushes every record on its own (plus a seek/tell for the   #
+# rollover check), so each audit event costs several syscalls. BufferedRotatingFileHandler keeps        #
+# formatted lines in memory and writes them out together, in one write() per batch.                     #
+#                                                                                                       #
+# Key Features:                                                                                         #
+# - Batch is written once buffer_size bytes are waiting or flush_interval seconds have passed           #
+# - ERROR and above are written immediately (together with anything already buffered)                   #
+# - Only whole lines are written, so records from several gunicorn workers never interleave mid-line    #
+# - Same rotation settings as RotatingFileHandler (maxBytes, backupCount)                               #
+# - BackgroundHandler: Runs any handler (here the buffered file handler) on a QueueListener thread, so  #
+#   request threads only format the record and put it on a queue; when the queue is idle for            #
+#   flush_interval seconds the listener flushes the handler, so quiet periods don't leave lines waiting #
+#                                                                                                       #
+# Trade-off:                                                                                            #
+# Used on its own, BufferedRotatingFileHandler only checks the interval when a record arrives, so the   #
+# last few lines wait for the next record or shutdown (logging.shutdown flushes at exit). Lines still   #
+# buffered are lost if the process is killed (SIGKILL, OOM); the AuditLog table keeps its own copy.     #
+#                                                                                                       #
+# This file lives at the project level because it is loaded while settings are being configured,        #
+# before the app registry is ready.                                                                     #
+# ----------------------------------------------------------------------------------------------------- #
+
+# Import tools:
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from django.utils.module_loading import import_string
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+
+    # ----------------------------------------------------------------------------- #
+    # Args:     filename (str): Log file path                                       #
+    #           buffer_size (int): Buffered bytes that trigger a write              #
+    #           flush_interval (float): Seconds a line waits at most (see header)   #
+    #           **kwargs: RotatingFileHandler options (maxBytes, backupCount, ...)  #
+    # ----------------------------------------------------------------------------- #
+    def __init__(self, filename, buffer_size=65536, flush_interval=1.0, **kwargs):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        super().__init__(filename, **kwargs)
+
+
+    # ----------------------------------------------------------------------------- #
+    # Format a record into the buffer, writing the batch out when it's due.         #
+    #                                                                               #
+    # Called by Handler.handle() with the handler lock held.                        #
+    #                                                                               #
+    # Args:     record (LogRecord): Record to log                                   #
+    # ----------------------------------------------------------------------------- #
+    def emit(self, record):
+        try:
+            line = self.format(record) + self.terminator
+            self._buffer.append(line)
+            self._buffered_bytes += len(line)
+
+            if (record.levelno >= logging.ERROR or
+                    self._buffered_bytes >= self.buffer_size or
+                    time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+    # ----------------------------------------------------------------------------- #
+    # Write all buffered lines with a single write(), rotating first if needed.     #
+    #                                                                               #
+    # Also called by close() and logging.shutdown(), so nothing buffered is lost    #
+    # on a normal exit.                                                             #
+    # ----------------------------------------------------------------------------- #
+    def flush(self):
+        self.acquire()
+        try:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return
+
+            if self.stream is None:
+                self.stream = self._open()
+
+            # Replaces RotatingFileHandler.shouldRollover(), which seeks on every record
+            if self.maxBytes > 0 and self.stream.tell() + self._buffered_bytes >= self.maxBytes:
+                self.doRollover()
+
+            self.stream.write(''.join(self._buffer))
+            self.stream.flush()
+            self._buffer = []
+            self._buffered_bytes = 0
+        finally:
+            self.release()
+
+
+class FlushingQueueListener(QueueListener):
+
+    # ----------------------------------------------------------------------------- #
+    # Args:     queue (Queue): Queue the records arrive on                          #
+    #           *handlers: Handlers that process the records                        #
+    #           flush_interval (float): Idle seconds before the handlers are        #
+    #           flushed (None: never, like QueueListener)                           #
+    # ----------------------------------------------------------------------------- #
+    def __init__(self, queue, *handlers, flush_interval=None, **kwargs):
+        super().__init__(queue, *handlers, **kwargs)
+        self.flush_interval = flush_interval
+
+
+    # Wait for the next record, flushing the handlers whenever the queue stays idle for flush_interval:
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+
+class BackgroundHandler(QueueHandler):
+
+    # ----------------------------------------------------------------------------- #
+    # Create the wrapped handler and start the thread that feeds it.                #
+    #                                                                               #
+    # Records are formatted on the calling thread (with this handler's formatter)   #
+    # and written by the wrapped handler on a QueueListener thread, so file I/O     #
+    # never blocks a request.                                                       #
+    #                                                                               #
+    # Args:     handler_class (str): Dotted path of the handler to run in the       #
+    #           background                                                          #
+    #           **kwargs: Arguments for handler_class                               #
+    # ----------------------------------------------------------------------------- #
+    def __init__(self, handler_class, **kwargs):
+        super().__init__(queue.SimpleQueue())
+        self.handler = import_string(handler_class)(**kwargs)
+        self.listener = FlushingQueueListener(
+            self.queue, self.handler, flush_interval=getattr(self.handler, 'flush_interval', None)
+        )
+        self.listener.start()
+        self.closed = False
+
+        # Threads don't survive a fork (e.g. gunicorn --preload), so the child starts its own listener
+        os.register_at_fork(after_in_child=self._restart_listener)
+
+
+    # Start a fresh listener thread in a forked child process (fork hooks can't be unregistered, hence the flag):
+    def _restart_listener(self):
+        if self.closed:
+            return
+        self.listener._thread = None
+        self.listener.start()
+
+
+    # ----------------------------------------------------------------------------- #
+    # Stop the listener (writing everything still queued), then close the wrapped   #
+    # handler. Called by logging.shutdown() at exit.                                #
+    # ----------------------------------------------------------------------------- #
+    def close(self):
+        self.closed = True
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.handler.close()
+        super().close()
@@ -404,6 +404,10 @@ AWS_SES_REGION_NAME = os.getenv('AWS_SES_REGION_NAME', 'us-east-1')
 AWS_SES_REGION_ENDPOINT = f'email.{AWS_SES_REGION_NAME}.amazonaws.com'
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@starview.app')
 
+# SQS queue subscribed to the SES bounce/complaint SNS topics (optional)
+# Consumed in batches by: python manage.py consume_ses_notifications
+SES_NOTIFICATION_QUEUE_URL = os.getenv('SES_NOTIFICATION_QUEUE_URL', '')
+
 # Password Reset Configuration
 # Token expires in 1 hour (3600 seconds) for security
 PASSWORD_RESET_TIMEOUT = 3600
@@ -447,7 +451,7 @@ REST_FRAMEWORK = {
 
     # Renderers
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'starview_app.utils.renderers.ORJSONRenderer',  # orjson encoder (faster than stdlib json)
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
 
@@ -640,6 +644,9 @@ CELERY_WORKER_MAX_TASKS_PER_CHILD = 1000  # Restart worker after 1000 tasks (pre
 
 # Automated tasks via django-crontab
 CRONJOBS = [
+    # Repair drifted location rating stats (running totals) nightly at 3:30 AM:
+    ('30 3 * * *', 'django.core.management.call_command', ['recalculate_location_ratings']),
+
     # Commands:
     # python manage.py crontab show     - Show all cronjobs
     # python manage.py crontab add      - Add all cronjobs
@@ -654,6 +661,13 @@ CRONJOBS = [
 LOGS_DIR = BASE_DIR / 'logs'
 LOGS_DIR.mkdir(exist_ok=True)
 
+# Master switch for audit logging (database and logs/audit.log); when False every log_* call returns None
+AUDIT_LOG_ENABLED = os.getenv('AUDIT_LOG_ENABLED', 'True') == 'True'
+
+# Batch AuditLog database inserts in a background thread (see starview_app/utils/audit_queue.py)
+# When False, each audit event is inserted synchronously within the request
+AUDIT_LOG_BATCHING = os.getenv('AUDIT_LOG_BATCHING', 'False') == 'True'
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -675,12 +689,16 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
+        # Writes audit lines in batches from a background thread (see django_project/log_handlers.py)
         'audit_file': {
             'level': 'INFO',
-            'class': 'logging.handlers.RotatingFileHandler',
+            '()': 'django_project.log_handlers.BackgroundHandler',
+            'handler_class': 'django_project.log_handlers.BufferedRotatingFileHandler',
             'filename': LOGS_DIR / 'audit.log',
             'maxBytes': 10485760,  # 10MB
             'backupCount': 10,
+            'buffer_size': 65536,  # 64KB
+            'flush_interval': 1.0,
             'formatter': 'json',
         },
     },
@@ -16,6 +16,7 @@
 
 # Import tools:
 from django.contrib import admin
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.urls import reverse
 from django.utils.html import format_html
 
@@ -26,6 +27,9 @@ from .models import Review, ReviewComment, ReviewPhoto, Report, Vote
 from .models import EmailBounce, EmailComplaint, EmailSuppressionList
 from .models import AuditLog
 
+# Import utilities:
+from .utils.pagination import CountEstimatePaginator
+
 
 
 # ----------------------------------------------------------------------------------------------------- #
@@ -69,6 +73,10 @@ class VoteAdmin(admin.ModelAdmin):
     ordering = ['-created_at']
     list_per_page = 50
 
+    # Votes grow without bound, so don't COUNT(*) the whole table on every page load
+    paginator = CountEstimatePaginator
+    show_full_result_count = False
+
     fieldsets = (
         # Section 1: What's being voted on (generic relationship)
         ('Vote Target', {
@@ -91,6 +99,20 @@ class VoteAdmin(admin.ModelAdmin):
     ]
 
 
+    # Load the voted objects with one query per content type (instead of one per row),
+    # along with the relations their __str__ methods read:
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'user',
+            'content_type'
+        ).prefetch_related(
+            GenericPrefetch('voted_object', [
+                Review.objects.select_related('user', 'location'),
+                ReviewComment.objects.select_related('user', 'review__user', 'review__location'),
+            ])
+        )
+
+
     # Display the type of object being voted on.
     # This returns the model name (e.g., 'review', 'reviewcomment):
     def get_voted_object_type(self, obj):
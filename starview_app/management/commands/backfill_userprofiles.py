@@ -0,0 +1,31 @@
+# ----------------------------------------------------------------------------------------------------- #
+# Django Management Command - UserProfile Backfill                                                      #
+#                                                                                                       #
+# Purpose:                                                                                              #
+# The User post_save signal creates a UserProfile when a user is created. It no longer re-checks for a  #
+# profile on every later User.save() (last_login updates, etc.), so users created without the signal    #
+# (raw SQL, bulk_create(), loaddata, data from before the signal existed) need this one-time backfill.  #
+#                                                                                                       #
+# Usage:                                                                                                #
+#   python manage.py backfill_userprofiles                                                              #
+# ----------------------------------------------------------------------------------------------------- #
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from starview_app.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Create missing UserProfile rows for existing users'
+
+    def handle(self, *args, **options):
+        user_ids = User.objects.filter(userprofile__isnull=True).values_list('id', flat=True)
+
+        # ignore_conflicts: a profile created concurrently by the signal is left as is
+        created = UserProfile.objects.bulk_create(
+            [UserProfile(user_id=user_id) for user_id in user_ids],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} missing user profile(s)'))
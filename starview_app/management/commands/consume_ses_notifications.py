@@ -0,0 +1,158 @@
+# ----------------------------------------------------------------------------------------------------- #
+# Django Management Command - SES Notification Queue Consumer                                           #
+#                                                                                                       #
+# Purpose:                                                                                              #
+# Processes AWS SES bounce and complaint notifications from an SQS queue in batches, as an alternative  #
+# to the per-request SNS webhooks. Each receive call long-polls for up to 10 messages, which are        #
+# processed in one database transaction and then deleted from the queue with a single batch call.       #
+#                                                                                                       #
+# Features:                                                                                             #
+# - Long polling (20 seconds) to avoid empty receives                                                   #
+# - One user lookup query and one transaction per batch of up to 10 notifications                       #
+# - Messages are only deleted after the batch commits (failed batches are redelivered by SQS, so        #
+#   configure a dead-letter queue on the SQS queue to catch poison messages)                            #
+# - Accepts both SNS-wrapped messages and raw message delivery                                          #
+#                                                                                                       #
+# Usage:                                                                                                #
+#   python manage.py consume_ses_notifications [options]                                                #
+#                                                                                                       #
+# Options:                                                                                              #
+#   --queue-url URL    SQS queue URL (default: settings.SES_NOTIFICATION_QUEUE_URL)                     #
+#   --wait-time N      Long-poll wait time in seconds (default: 20, max: 20)                            #
+#   --once             Process a single batch and exit (useful for cronjobs)                            #
+#                                                                                                       #
+# Integration:                                                                                          #
+# AWS SES → AWS SNS → AWS SQS → This command → EmailBounce/EmailComplaint models                        #
+# ----------------------------------------------------------------------------------------------------- #
+
+import json
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from starview_app.services import EmailEventService
+import boto3
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Consume SES bounce/complaint notifications from SQS in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue-url',
+            type=str,
+            default=getattr(settings, 'SES_NOTIFICATION_QUEUE_URL', ''),
+            help='SQS queue URL (default: settings.SES_NOTIFICATION_QUEUE_URL)',
+        )
+        parser.add_argument(
+            '--wait-time',
+            type=int,
+            default=20,
+            help='Long-poll wait time in seconds (default: 20, max: 20)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process a single batch and exit',
+        )
+
+
+    def handle(self, *args, **options):
+        self.queue_url = options['queue_url']
+        self.wait_time = max(0, min(options['wait_time'], 20))
+
+        if not self.queue_url:
+            raise CommandError('No queue URL configured (set SES_NOTIFICATION_QUEUE_URL or pass --queue-url)')
+
+        # SQS lives alongside SES, so reuse the SES credentials
+        self.sqs = boto3.client(
+            'sqs',
+            region_name=settings.AWS_SES_REGION_NAME,
+            aws_access_key_id=settings.AWS_SES_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SES_SECRET_ACCESS_KEY,
+        )
+
+        self.stdout.write(f'Consuming SES notifications from {self.queue_url}')
+
+        try:
+            while True:
+                self.process_batch()
+                if options['once']:
+                    break
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('\nStopped'))
+
+
+    # Receive up to 10 messages, process them in one transaction, then delete them:
+    def process_batch(self):
+        try:
+            response = self.sqs.receive_message(
+                QueueUrl=self.queue_url,
+                MaxNumberOfMessages=10,
+                WaitTimeSeconds=self.wait_time,
+            )
+        except ClientError as e:
+            logger.error(f"Error receiving SES notifications from SQS: {str(e)}")
+            return 0
+
+        sqs_messages = response.get('Messages', [])
+        if not sqs_messages:
+            return 0
+
+        notifications = []
+        for sqs_message in sqs_messages:
+            notification = self.parse_message(sqs_message)
+            if notification is not None:
+                notifications.append(notification)
+
+        # Failed batches are left on the queue and redelivered after the visibility timeout
+        try:
+            results = EmailEventService.process_batch(notifications)
+        except Exception as e:
+            logger.error(f"Error processing SES notification batch: {str(e)}", exc_info=True)
+            return 0
+
+        self.delete_messages(sqs_messages)
+
+        self.stdout.write(
+            f"Processed {len(sqs_messages)} message(s): "
+            f"{results['bounces']} bounce(s), {results['complaints']} complaint(s), "
+            f"{results['skipped']} skipped"
+        )
+        return len(sqs_messages)
+
+
+    # ----------------------------------------------------------------------------- #
+    # Extract (message_id, SES message) from an SQS message.                        #
+    #                                                                               #
+    # SNS → SQS subscriptions wrap the SES message in an SNS envelope unless raw    #
+    # message delivery is enabled, so both formats are accepted.                    #
+    # Returns None for unparseable messages (they are deleted with the batch).      #
+    # ----------------------------------------------------------------------------- #
+    def parse_message(self, sqs_message):
+        try:
+            body = json.loads(sqs_message['Body'])
+            if body.get('Type') == 'Notification':
+                return body.get('MessageId', ''), json.loads(body.get('Message', '{}'))
+            return sqs_message['MessageId'], body
+        except (json.JSONDecodeError, KeyError, AttributeError):
+            logger.error(f"Invalid SES notification in SQS message {sqs_message.get('MessageId')}")
+            return None
+
+
+    # Delete processed messages with a single DeleteMessageBatch call:
+    def delete_messages(self, sqs_messages):
+        try:
+            response = self.sqs.delete_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=[
+                    {'Id': str(idx), 'ReceiptHandle': m['ReceiptHandle']}
+                    for idx, m in enumerate(sqs_messages)
+                ],
+            )
+            for failure in response.get('Failed', []):
+                logger.warning(f"Failed to delete SQS message {failure.get('Id')}: {failure.get('Message')}")
+        except ClientError as e:
+            logger.error(f"Error deleting SES notifications from SQS: {str(e)}")
@@ -0,0 +1,72 @@
+# ----------------------------------------------------------------------------------------------------- #
+# Django Management Command - Location Rating Repair                                                    #
+#                                                                                                       #
+# Purpose:                                                                                              #
+# Review saves and deletes keep Location.rating_count, rating_sum and average_rating up to date with    #
+# O(1) deltas. Writes that skip the ORM signals (raw SQL, QuerySet.update() of ratings, fixtures) can   #
+# still make the running totals drift, so this command recomputes them from the reviews table. It runs  #
+# nightly via CRONJOBS in settings.py.                                                                  #
+#                                                                                                       #
+# Usage:                                                                                                #
+#   python manage.py recalculate_location_ratings [options]                                             #
+#                                                                                                       #
+# Options:                                                                                              #
+#   --dry-run          Report locations with drifted stats without fixing them                          #
+# ----------------------------------------------------------------------------------------------------- #
+
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, Sum
+from starview_app.models import Location
+
+
+class Command(BaseCommand):
+    help = 'Recompute location rating count, sum and average from reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted locations without making changes',
+        )
+
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+
+        locations = Location.objects.annotate(
+            review_count=Count('reviews'),
+            review_sum=Sum('reviews__rating'),
+            review_avg=Avg('reviews__rating'),
+        ).only('id', 'name', 'rating_count', 'rating_sum', 'average_rating')
+
+        fixed = 0
+        for location in locations.iterator():
+            rating_count = location.review_count
+            rating_sum = location.review_sum or 0
+            average_rating = round(Decimal(location.review_avg), 2) if location.review_avg else Decimal('0.00')
+
+            if (location.rating_count == rating_count and
+                    location.rating_sum == rating_sum and
+                    location.average_rating == average_rating):
+                continue
+
+            fixed += 1
+            self.stdout.write(
+                f'{location.name} (ID: {location.id}): '
+                f'{location.rating_count}/{location.rating_sum}/{location.average_rating} → '
+                f'{rating_count}/{rating_sum}/{average_rating}'
+            )
+
+            if not dry_run:
+                Location.objects.filter(pk=location.pk).update(
+                    rating_count=rating_count,
+                    rating_sum=rating_sum,
+                    average_rating=average_rating,
+                )
+
+        verb = 'Would fix' if dry_run else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} rating stats for {fixed} location(s)'))
@@ -0,0 +1,38 @@
+# ----------------------------------------------------------------------------------------------------- #
+# Django Management Command - Vote Counter Repair                                                       #
+#                                                                                                       #
+# Purpose:                                                                                              #
+# Vote post_save/post_delete signals keep Review and ReviewComment upvote_count/downvote_count up to    #
+# date with O(1) deltas. Writes that bypass signals (raw SQL, QuerySet.update() on votes, restores)     #
+# can make them drift. This command recomputes them from the votes table in bulk.                       #
+#                                                                                                       #
+# Usage:                                                                                                #
+#   python manage.py recalculate_vote_counters [options]                                                #
+#                                                                                                       #
+# Options:                                                                                              #
+#   --batch-size N     Rows per bulk UPDATE statement (default: 1000)                                   #
+# ----------------------------------------------------------------------------------------------------- #
+
+from django.core.management.base import BaseCommand
+from starview_app.models import Review, ReviewComment
+from starview_app.services import VoteService
+
+
+class Command(BaseCommand):
+    help = 'Recompute review and comment vote counters from votes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk UPDATE statement (default: 1000)',
+        )
+
+
+    def handle(self, *args, **options):
+        for model in (Review, ReviewComment):
+            updated = VoteService.recompute_counters(model, batch_size=options['batch_size'])
+            self.stdout.write(f'{model.__name__}: recomputed counters for {updated} row(s)')
+
+        self.stdout.write(self.style.SUCCESS('Vote counters recomputed'))
@@ -0,0 +1,19 @@
+# Index auth_user.email for email → user lookups (suppression list, SES webhooks).
+# Django's built-in User model doesn't index email, so the index is added with raw SQL.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('starview_app', '0002_email_events'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS auth_user_email_idx ON auth_user (email);',
+            reverse_sql='DROP INDEX IF EXISTS auth_user_email_idx;',
+        ),
+    ]
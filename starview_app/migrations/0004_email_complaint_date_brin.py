@@ -0,0 +1,38 @@
+# Replace the btree index on EmailComplaint.complaint_date with a BRIN index.
+# Complaints are inserted in time order, so on PostgreSQL a BRIN index serves date range filters at a
+# fraction of the btree's size. Other backends (SQLite in development) get a plain index instead.
+# The (email, -complaint_date) btree is kept for per-email history lookups.
+
+from django.db import migrations, models
+
+
+def create_complaint_date_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS email_complaint_date_brin ON starview_email_complaint '
+            'USING brin (complaint_date) WITH (pages_per_range = 64);'
+        )
+    else:
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS email_complaint_date_brin ON starview_email_complaint (complaint_date);'
+        )
+
+
+def drop_complaint_date_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS email_complaint_date_brin;')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('starview_app', '0003_auth_user_email_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailcomplaint',
+            name='complaint_date',
+            field=models.DateTimeField(auto_now_add=True, help_text='When the complaint was received'),
+        ),
+        migrations.RunPython(create_complaint_date_index, drop_complaint_date_index),
+    ]
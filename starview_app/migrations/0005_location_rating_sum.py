@@ -0,0 +1,37 @@
+# Generated by Django 5.1.13 on 2026-10-18 04:26
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+# Backfill rating stats from existing reviews so the running totals start out correct:
+def backfill_rating_stats(apps, schema_editor):
+    Location = apps.get_model('starview_app', 'Location')
+    locations = Location.objects.annotate(
+        review_count=Count('reviews'),
+        review_sum=Sum('reviews__rating'),
+        review_avg=Avg('reviews__rating'),
+    ).filter(review_count__gt=0)
+
+    for location in locations.iterator():
+        Location.objects.filter(pk=location.pk).update(
+            rating_count=location.review_count,
+            rating_sum=location.review_sum,
+            average_rating=round(location.review_avg, 2),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('starview_app', '0004_email_complaint_date_brin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, help_text='Sum of all review ratings (average = sum / count)'),
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.13 on 2026-10-18 04:34
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+# Backfill the counters from existing votes (one grouped query over the review votes):
+def backfill_vote_counters(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Review = apps.get_model('starview_app', 'Review')
+    Vote = apps.get_model('starview_app', 'Vote')
+
+    review_type = ContentType.objects.filter(app_label='starview_app', model='review').first()
+    if review_type is None:
+        return
+
+    counts = Vote.objects.filter(content_type=review_type).values('object_id').annotate(
+        upvotes=Count('id', filter=Q(is_upvote=True)),
+        downvotes=Count('id', filter=Q(is_upvote=False)),
+    )
+
+    reviews = [
+        Review(pk=row['object_id'], upvote_count=row['upvotes'], downvote_count=row['downvotes'])
+        for row in counts
+    ]
+    existing_ids = set(Review.objects.filter(pk__in=[r.pk for r in reviews]).values_list('pk', flat=True))
+    Review.objects.bulk_update(
+        [r for r in reviews if r.pk in existing_ids],
+        ['upvote_count', 'downvote_count'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('starview_app', '0005_location_rating_sum'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='downvote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='upvote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_vote_counters, migrations.RunPython.noop),
+    ]
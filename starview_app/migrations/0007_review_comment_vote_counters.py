@@ -0,0 +1,53 @@
+# Generated by Django 5.1.13 on 2026-10-18 04:39
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+# Backfill the counters from existing votes (one grouped query over the comment votes):
+def backfill_vote_counters(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    ReviewComment = apps.get_model('starview_app', 'ReviewComment')
+    Vote = apps.get_model('starview_app', 'Vote')
+
+    comment_type = ContentType.objects.filter(app_label='starview_app', model='reviewcomment').first()
+    if comment_type is None:
+        return
+
+    counts = Vote.objects.filter(content_type=comment_type).values('object_id').annotate(
+        upvotes=Count('id', filter=Q(is_upvote=True)),
+        downvotes=Count('id', filter=Q(is_upvote=False)),
+    )
+
+    comments = [
+        ReviewComment(pk=row['object_id'], upvote_count=row['upvotes'], downvote_count=row['downvotes'])
+        for row in counts
+    ]
+    existing_ids = set(ReviewComment.objects.filter(pk__in=[c.pk for c in comments]).values_list('pk', flat=True))
+    ReviewComment.objects.bulk_update(
+        [c for c in comments if c.pk in existing_ids],
+        ['upvote_count', 'downvote_count'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('starview_app', '0006_review_vote_counters'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewcomment',
+            name='downvote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='reviewcomment',
+            name='upvote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_vote_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.13 on 2026-10-18 04:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('starview_app', '0007_review_comment_vote_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['content_type', 'object_id', 'is_upvote'], name='vote_ct_obj_up_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='vote',
+            name='starview_ap_content_b6271c_idx',
+        ),
+    ]
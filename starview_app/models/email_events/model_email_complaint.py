@@ -68,9 +68,9 @@ class EmailComplaint(models.Model):
     )
 
     # Tracking
+    # Range-indexed by email_complaint_date_brin (migration 0004, BRIN on PostgreSQL)
     complaint_date = models.DateTimeField(
         auto_now_add=True,
-        db_index=True,
         help_text="When the complaint was received"
     )
 
@@ -137,18 +137,14 @@ class EmailSuppressionList(models.Model):
     #   EmailSuppressionList: Created or existing suppression record
     @classmethod
     def add_to_suppression(cls, email, reason, bounce=None, complaint=None, notes=''):
-        # Find user if exists
-        user = None
-        try:
-            user = User.objects.get(email=email.lower())
-        except User.DoesNotExist:
-            pass
+        # Find user ID if exists (only the ID is needed for the foreign key)
+        user_id = User.objects.filter(email=email.lower()).values_list('id', flat=True).first()
 
         # Create or update suppression
         suppression, created = cls.objects.get_or_create(
             email=email.lower(),
             defaults={
-                'user': user,
+                'user_id': user_id,
                 'reason': reason,
                 'bounce': bounce,
                 'complaint': complaint,
@@ -29,6 +29,9 @@ from starview_app.utils import (
     validate_elevation
 )
 
+# Running totals only ever written with F() deltas (see Review.apply_rating_delta), never by a full save:
+RATING_STATS_FIELDS = ('rating_count', 'rating_sum', 'average_rating')
+
 
 
 class Location(models.Model):
@@ -53,6 +56,7 @@ class Location(models.Model):
 
     # Rating aggregation:
     rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0, help_text="Sum of all review ratings (average = sum / count)")
     average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00, help_text="Average rating (0.00-5.00)")
 
     # Verification (staff only):
@@ -88,13 +92,23 @@ class Location(models.Model):
             validate_elevation(self.elevation)
 
             is_new = not self.pk
+            update_fields = kwargs.get('update_fields') or []
+
+            # A full save of an existing row would write back the rating stats as they were loaded,
+            # undoing F() deltas from reviews saved in the meantime, so leave those columns out:
+            if not self._state.adding and not args and kwargs.get('update_fields') is None:
+                deferred = self.get_deferred_fields()
+                kwargs['update_fields'] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name not in RATING_STATS_FIELDS and field.attname not in deferred
+                ]
 
             # First save to get the ID:
             super().save(*args, **kwargs)
 
             # If this is a new location or coordinates have changed, enrich data
             if is_new or any(
-                    field in kwargs.get('update_fields', [])
+                    field in update_fields
                     for field in ['latitude', 'longitude']
             ):
                 print(f"Enriching location {self.name} (ID: {self.pk})")
@@ -109,9 +123,21 @@ class Location(models.Model):
 
                 if use_celery:
                     # Async enrichment via Celery (requires worker running)
-                    from starview_app.utils.tasks import enrich_location_data
-                    enrich_location_data.delay(self.pk)
-                    print(f"  → Queued async enrichment task for location {self.pk}")
+                    # A task that's queued but not started yet will read the latest coordinates, so don't queue another
+                    from django.core.cache import cache
+                    from starview_app.utils.cache import location_enrichment_pending_key
+                    from starview_app.utils.tasks import enrich_location_data, ENRICHMENT_PENDING_TIMEOUT
+
+                    if cache.add(location_enrichment_pending_key(self.pk), True, ENRICHMENT_PENDING_TIMEOUT):
+                        try:
+                            enrich_location_data.delay(self.pk)
+                        except Exception:
+                            # Not queued (e.g. broker down): clear the marker so the next edit can queue one
+                            cache.delete(location_enrichment_pending_key(self.pk))
+                            raise
+                        print(f"  → Queued async enrichment task for location {self.pk}")
+                    else:
+                        print(f"  → Enrichment task already queued for location {self.pk}")
                 else:
                     # Sync enrichment (fallback when no worker available)
                     print(f"  → Running sync enrichment (Celery disabled)")
@@ -8,16 +8,20 @@
 # Key Features:                                                                                         #
 # - Rating validation: 1-5 star ratings enforced via validators                                         #
 # - Unique constraint: One review per user per location                                                 #
-# - Vote tracking: GenericRelation to Vote model for upvote/downvote functionality                      #
-# - Automatic aggregation: Updates Location.rating_count and Location.average_rating on save/delete     #
+# - Vote tracking: GenericRelation to Vote model, with denormalized upvote/downvote counters            #
+# - Automatic aggregation: Applies O(1) rating deltas to the Location's rating stats on save (deletes   #
+#   are handled by a post_delete signal in utils/signals.py, so cascade and queryset deletes count too) #
 # - Edit detection: Tracks whether review has been modified after creation                              #
+# - No-op saves: Re-saving an unchanged review skips the write and the rating update                    #
 # ----------------------------------------------------------------------------------------------------- #
 
 # Import tools:
+from datetime import timedelta
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import User
-from django.db.models import Avg
+from django.db.models import Avg, Count, Sum, F, Case, When, DecimalField, FloatField
+from django.db.models.functions import Cast, Round
 from django.contrib.contenttypes.fields import GenericRelation
 
 # Import models:
@@ -26,6 +30,9 @@ from . import Location
 # Import validators:
 from starview_app.utils import sanitize_html
 
+# Reviews updated more than this long after creation count as edited:
+EDIT_THRESHOLD = timedelta(seconds=10)
+
 
 
 class Review(models.Model):
@@ -44,6 +51,10 @@ class Review(models.Model):
     # Generic relation to Vote model (enables upvote/downvote tracking):
     votes = GenericRelation('Vote', related_query_name='review')
 
+    # Vote counters (kept in sync by Vote post_save/post_delete signals):
+    upvote_count = models.PositiveIntegerField(default=0)
+    downvote_count = models.PositiveIntegerField(default=0)
+
 
     class Meta:
         unique_together = ('user', 'location')  # One review per user per location
@@ -64,45 +75,32 @@ class Review(models.Model):
     # Returns the net vote score (upvotes minus downvotes):
     @property
     def vote_count(self):
-        # Use prefetched votes if available to avoid database queries
-        if hasattr(self, '_prefetched_objects_cache') and 'votes' in self._prefetched_objects_cache:
-            votes_list = list(self.votes.all())
-            upvotes = sum(1 for v in votes_list if v.is_upvote)
-            downvotes = sum(1 for v in votes_list if not v.is_upvote)
-            return upvotes - downvotes
-        else:
-            upvotes = self.votes.filter(is_upvote=True).count()
-            downvotes = self.votes.filter(is_upvote=False).count()
-            return upvotes - downvotes
+        return self.upvote_count - self.downvote_count
 
 
-    # Returns the total number of upvotes:
+    # Checks if review was edited (updated_at > 10 seconds after created_at):
     @property
-    def upvote_count(self):
-        # Use prefetched votes if available to avoid database queries
-        if hasattr(self, '_prefetched_objects_cache') and 'votes' in self._prefetched_objects_cache:
-            votes_list = list(self.votes.all())
-            return sum(1 for v in votes_list if v.is_upvote)
-        else:
-            return self.votes.filter(is_upvote=True).count()
+    def is_edited(self):
+        # Use annotation if available (computed in SQL by ReviewViewSet)
+        if hasattr(self, 'is_edited_annotated'):
+            return self.is_edited_annotated
 
+        return self.updated_at - self.created_at > EDIT_THRESHOLD
 
-    # Returns the total number of downvotes:
-    @property
-    def downvote_count(self):
-        # Use prefetched votes if available to avoid database queries
-        if hasattr(self, '_prefetched_objects_cache') and 'votes' in self._prefetched_objects_cache:
-            votes_list = list(self.votes.all())
-            return sum(1 for v in votes_list if not v.is_upvote)
-        else:
-            return self.votes.filter(is_upvote=False).count()
 
+    # Snapshot the column values as loaded so save() can detect no-op updates:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance._tracked_values()
+        return instance
 
-    # Checks if review was edited (updated_at > 10 seconds after created_at):
-    @property
-    def is_edited(self):
-        from datetime import timedelta
-        return self.updated_at - self.created_at > timedelta(seconds=10)
+
+    # Values compared by save() to detect changes: every column but the primary key (None if any are deferred):
+    def _tracked_values(self):
+        if self.get_deferred_fields():
+            return None
+        return tuple(getattr(self, field.attname) for field in self._meta.concrete_fields if not field.primary_key)
 
 
     # Override save to sanitize HTML and update location rating statistics:
@@ -111,36 +109,79 @@ class Review(models.Model):
         if self.comment:
             self.comment = sanitize_html(self.comment)
 
-        is_new = self.pk is None
-        old_rating = None
+        # Nothing changed since the review was loaded, so skip the write (and the updated_at
+        # bump that would mark the review as edited). An explicit update_fields always writes:
+        loaded_values = getattr(self, '_loaded_values', None)
+        if (self.pk is not None and not kwargs.get('force_insert') and kwargs.get('update_fields') is None and
+                loaded_values is not None and loaded_values == self._tracked_values()):
+            return
 
-        if not is_new:
-            old_review = Review.objects.get(pk=self.pk)
-            old_rating = old_review.rating
+        # Fetch only the previous rating and location (needed for the rating delta):
+        old = None
+        if self.pk is not None:
+            old = Review.objects.filter(pk=self.pk).values_list('rating', 'location_id').first()
 
         super().save(*args, **kwargs)
-        self.update_location_ratings()
-
-
-    # Override delete to automatically update location rating statistics:
-    def delete(self, *args, **kwargs):
-        location = self.location
-        super().delete(*args, **kwargs)
-        self.update_location_ratings(location=location)
+        self._loaded_values = self._tracked_values()
 
+        # updated_at just changed, so a queryset's is_edited annotation is now stale
+        self.__dict__.pop('is_edited_annotated', None)
 
-    # Updates the parent location's rating_count and average_rating fields:
+        if old is None:
+            self.apply_rating_delta(self.location_id, 1, self.rating)
+        else:
+            old_rating, old_location_id = old
+            if old_location_id != self.location_id:
+                # Review moved (admin edit): take it off the old location, add it to the new one
+                self.apply_rating_delta(old_location_id, -1, -old_rating)
+                self.apply_rating_delta(self.location_id, 1, self.rating)
+            elif old_rating != self.rating:
+                self.apply_rating_delta(self.location_id, 0, self.rating - old_rating)
+
+
+    # ----------------------------------------------------------------------------- #
+    # Adjust a location's rating stats by a delta in a single UPDATE query.         #
+    #                                                                               #
+    # Keeps rating_count and rating_sum as running totals so no write has to scan   #
+    # the location's reviews. The F() expressions are evaluated by the database,    #
+    # so concurrent reviews of the same location don't overwrite each other.        #
+    # Expressions on the right of SET see the pre-update row, hence the deltas are  #
+    # added again when computing the new average.                                   #
+    #                                                                               #
+    # Args:     location_id (int): Location to update                               #
+    #           count_delta (int): Change in number of reviews (1, 0 or -1)         #
+    #           sum_delta (int): Change in the sum of ratings                       #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def apply_rating_delta(location_id, count_delta, sum_delta):
+        new_count = F('rating_count') + count_delta
+        new_sum = F('rating_sum') + sum_delta
+
+        Location.objects.filter(pk=location_id).update(
+            rating_count=new_count,
+            rating_sum=new_sum,
+            average_rating=Case(
+                When(rating_count__gt=-count_delta, then=Round(Cast(new_sum, FloatField()) / Cast(new_count, FloatField()), 2)),
+                default=0,
+                output_field=DecimalField(max_digits=3, decimal_places=2),
+            ),
+        )
+
+
+    # Recomputes the parent location's rating stats from scratch (used to repair drift):
     def update_location_ratings(self, location=None):
         if location is None:
             location = self.location
 
-        reviews = location.reviews.all()
-        location.rating_count = reviews.count()
-
-        if location.rating_count > 0:
-            avg_rating = reviews.aggregate(Avg('rating'))['rating__avg']
-            location.average_rating = round(avg_rating, 2) if avg_rating else 0
-        else:
-            location.average_rating = 0
-
-        location.save(update_fields=['rating_count', 'average_rating'])
+        # Count, sum and average in one query:
+        stats = location.reviews.aggregate(count=Count('id'), total=Sum('rating'), avg=Avg('rating'))
+        location.rating_count = stats['count'] or 0
+        location.rating_sum = stats['total'] or 0
+        location.average_rating = round(stats['avg'], 2) if stats['avg'] else 0
+
+        # Write just the stats columns (skips Location.save() sanitizing and validation):
+        Location.objects.filter(pk=location.pk).update(
+            rating_count=location.rating_count,
+            rating_sum=location.rating_sum,
+            average_rating=location.average_rating,
+        )
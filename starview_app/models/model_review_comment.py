@@ -8,6 +8,7 @@
 # Key Features:                                                                                         #
 # - Threaded discussion: Comments belong to reviews                                                     #
 # - Vote tracking: GenericRelation to Vote model for upvote/downvote functionality                      #
+# - Vote counters: upvote_count/downvote_count columns kept in sync by Vote signals                     #
 # - Edit detection: Tracks whether comment has been modified after creation                             #
 # - User vote lookup: Method to check how a specific user voted on a comment                            #
 # - Character limit: 500 character maximum to encourage concise discussion                              #
@@ -20,6 +21,7 @@ from django.contrib.contenttypes.fields import GenericRelation
 
 # Import models:
 from . import Review
+from .model_review import EDIT_THRESHOLD
 
 # Import validators:
 from starview_app.utils import sanitize_html
@@ -41,6 +43,10 @@ class ReviewComment(models.Model):
     # Generic relation to Vote model (enables upvote/downvote tracking):
     votes = GenericRelation('Vote', related_query_name='comment')
 
+    # Vote counters (kept in sync by Vote post_save/post_delete signals):
+    upvote_count = models.PositiveIntegerField(default=0)
+    downvote_count = models.PositiveIntegerField(default=0)
+
 
     class Meta:
         ordering = ['created_at']
@@ -51,28 +57,6 @@ class ReviewComment(models.Model):
         return f"Comment by {self.user.username} on {self.review}"
 
 
-    # Returns the total number of upvotes:
-    @property
-    def upvote_count(self):
-        # Use prefetched votes if available to avoid database queries
-        if hasattr(self, '_prefetched_objects_cache') and 'votes' in self._prefetched_objects_cache:
-            votes_list = list(self.votes.all())
-            return sum(1 for v in votes_list if v.is_upvote)
-        else:
-            return self.votes.filter(is_upvote=True).count()
-
-
-    # Returns the total number of downvotes:
-    @property
-    def downvote_count(self):
-        # Use prefetched votes if available to avoid database queries
-        if hasattr(self, '_prefetched_objects_cache') and 'votes' in self._prefetched_objects_cache:
-            votes_list = list(self.votes.all())
-            return sum(1 for v in votes_list if not v.is_upvote)
-        else:
-            return self.votes.filter(is_upvote=False).count()
-
-
     # Returns how a specific user voted ('up', 'down', or None):
     def get_user_vote(self, user):
         if not user.is_authenticated:
@@ -88,8 +72,7 @@ class ReviewComment(models.Model):
     # Checks if comment was edited (updated_at > 10 seconds after created_at):
     @property
     def is_edited(self):
-        from datetime import timedelta
-        return self.updated_at - self.created_at > timedelta(seconds=10)
+        return self.updated_at - self.created_at > EDIT_THRESHOLD
 
 
     # Override save to sanitize HTML content:
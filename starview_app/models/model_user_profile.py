@@ -15,6 +15,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.utils.functional import cached_property
 
 
 
@@ -30,14 +31,21 @@ class UserProfile(models.Model):
     profile_picture = models.ImageField(upload_to='profile_pics/', null=True, blank=True)
 
 
-    # Returns profile picture URL or default if none set:
-    @property
+    # Returns profile picture URL or default if none set (resolved once per instance,
+    # since serializers read it several times for the same user):
+    @cached_property
     def get_profile_picture_url(self):
-        if self.profile_picture and hasattr(self.profile_picture, 'url'):
+        if self.profile_picture:
             return self.profile_picture.url
         return settings.DEFAULT_PROFILE_PICTURE
 
 
+    # Drop the memoized URL when the picture may have changed:
+    def save(self, *args, **kwargs):
+        self.__dict__.pop('get_profile_picture_url', None)
+        super().save(*args, **kwargs)
+
+
     # String representation for admin interface and debugging:
     def __str__(self):
         return f'{self.user.username} Profile'
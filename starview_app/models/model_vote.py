@@ -10,6 +10,7 @@
 # - Vote types: Boolean field (True = upvote, False = downvote)                                         #
 # - Unique constraint: Prevents users from voting multiple times on the same content                    #
 # - Audit trail: Tracks who voted and when                                                              #
+# - Counter tracking: Remembers the loaded vote type so signals can keep denormalized counts in sync    #
 #                                                                                                       #
 # ContentTypes Framework:                                                                               #
 # Uses three fields to create generic relationships:                                                    #
@@ -43,12 +44,21 @@ class Vote(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['content_type', 'object_id']),
+            # is_upvote is included so per-object up/down counts are index-only scans
+            models.Index(fields=['content_type', 'object_id', 'is_upvote'], name='vote_ct_obj_up_idx'),
             models.Index(fields=['user', '-created_at']),
         ]
         unique_together = ('user', 'content_type', 'object_id')  # One vote per user per object
 
 
+    # Remember the vote type as loaded so the counter signals can tell when a vote flips:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_upvote = instance.__dict__.get('is_upvote')
+        return instance
+
+
     # Returns the model name of the voted object (e.g., 'review', 'reviewcomment'):
     @property
     def voted_object_type(self):
@@ -35,6 +35,7 @@ from .serializer_location import (
 from .serializer_user import (
     UserSerializer,
     UserProfileSerializer,
+    UserMiniSerializer,
 )
 
 # Favorite location serializers:
@@ -68,6 +69,7 @@ __all__ = [
     # User serializers
     'UserSerializer',
     'UserProfileSerializer',
+    'UserMiniSerializer',
 
     # Favorite location serializers
     'FavoriteLocationSerializer',
@@ -19,11 +19,11 @@
 # ----------------------------------------------------------------------------------------------------- #
 
 # Import tools:
-from django.db.models import Avg
 from rest_framework import serializers
 from ..models import Location
 from ..models import FavoriteLocation
 from . import ReviewSerializer
+from .serializer_user import UserMiniSerializer
 
 
 
@@ -39,18 +39,16 @@ from . import ReviewSerializer
 # - 1 location with 5 reviews: 9 queries, ~7KB - ✅ Fast                        #
 # - 1 location with 100 reviews: Would be slow and large payload               #
 #                                                                               #
-# RECOMMENDED FRONTEND PATTERN:                                                 #
-# Instead of using this serializer's nested reviews, fetch reviews separately:  #
-#   1. GET /api/locations/{id}/ - Use LocationListSerializer (no nested reviews)#
+# The detail view only uses this serializer for /api/locations/{id}/?include=   #
+# reviews (backward compatibility). By default it returns LocationListSerializer#
+# and clients fetch reviews separately:                                         #
+#   1. GET /api/locations/{id}/ - LocationListSerializer (no nested reviews)    #
 #   2. GET /api/locations/{id}/reviews/?page=1 - Paginated reviews (20 per page)#
-#                                                                               #
-# TO IMPLEMENT: Change get_serializer_class() in LocationViewSet to return     #
-# LocationListSerializer for 'retrieve' action, not just 'list' action.        #
 # ----------------------------------------------------------------------------- #
 class LocationSerializer(serializers.ModelSerializer):
-    added_by = serializers.SerializerMethodField()
+    added_by = UserMiniSerializer(read_only=True)
     is_favorited = serializers.SerializerMethodField()
-    verified_by = serializers.SerializerMethodField()
+    verified_by = UserMiniSerializer(read_only=True)
 
     reviews = ReviewSerializer(many=True, read_only=True)  # ⚠️ Returns ALL reviews - see warning above
     average_rating = serializers.SerializerMethodField()
@@ -81,25 +79,20 @@ class LocationSerializer(serializers.ModelSerializer):
                             ]
 
 
-    def get_added_by(self, obj):
-        return {
-            'id': obj.added_by.id,
-            'username': obj.added_by.username
-        } if obj.added_by else None
-
-
     def get_average_rating(self, obj):
-        # Use annotation if available (from optimized queryset), otherwise compute
+        # Use annotation if available (from optimized queryset), otherwise use the
+        # stored stats that Review.save() and the Review post_delete signal keep up to date (no query)
         if hasattr(obj, 'average_rating_annotated'):
             return obj.average_rating_annotated
-        return obj.reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
+        return float(obj.average_rating) if obj.rating_count else None
 
 
     def get_review_count(self, obj):
-        # Use annotation if available (from optimized queryset), otherwise compute
+        # Use annotation if available (from optimized queryset), otherwise use the
+        # stored count (no query)
         if hasattr(obj, 'review_count_annotated'):
             return obj.review_count_annotated
-        return obj.reviews.count()
+        return obj.rating_count
 
 
     def get_is_favorited(self, obj):
@@ -107,6 +100,11 @@ class LocationSerializer(serializers.ModelSerializer):
         if hasattr(obj, 'is_favorited_annotated'):
             return obj.is_favorited_annotated
 
+        # Use the user's favorite IDs if the view loaded them (one query for all rows)
+        favorite_location_ids = self.context.get('favorite_location_ids')
+        if favorite_location_ids is not None:
+            return obj.id in favorite_location_ids
+
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return FavoriteLocation.objects.filter(
@@ -118,15 +116,6 @@ class LocationSerializer(serializers.ModelSerializer):
         return False
 
 
-    def get_verified_by(self, obj):
-        if obj.verified_by:
-            return {
-                'id': obj.verified_by.id,
-                'username': obj.verified_by.username
-            }
-        return None
-
-
 
 # ----------------------------------------------------------------------------- #
 # Lightweight serializer optimized for map marker display.                      #
@@ -148,6 +137,11 @@ class MapLocationSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_is_favorited(self, obj):
+        # Use the user's favorite IDs if the view loaded them (one query for all rows)
+        favorite_location_ids = self.context.get('favorite_location_ids')
+        if favorite_location_ids is not None:
+            return obj.id in favorite_location_ids
+
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return FavoriteLocation.objects.filter(
@@ -183,14 +177,18 @@ class LocationInfoPanelSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-    # Calculate average rating without fetching full review objects:
+    # Average rating from the queryset annotation or the stored stats (no query):
     def get_average_rating(self, obj):
-        return obj.reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
+        if hasattr(obj, 'average_rating_annotated'):
+            return obj.average_rating_annotated
+        return float(obj.average_rating) if obj.rating_count else None
 
 
-    # Get review count without fetching full review objects:
+    # Review count from the queryset annotation or the stored count (no query):
     def get_review_count(self, obj):
-        return obj.reviews.count()
+        if hasattr(obj, 'review_count_annotated'):
+            return obj.review_count_annotated
+        return obj.rating_count
 
 
 
@@ -199,7 +197,7 @@ class LocationInfoPanelSerializer(serializers.ModelSerializer):
 #                                                                               #
 # This serializer is used for the location list API endpoint (/api/locations/)  #
 # and excludes nested review data to prevent N+1 query problems. Instead of     #
-# including full nested ReviewSerializer objects, it uses annotations from the  #
+# including full nested ReviewSerializer objects, it reads annotations from the #
 # ViewSet queryset to provide review_count and average_rating.                  #
 #                                                                               #
 # Performance Impact:                                                           #
@@ -209,13 +207,14 @@ class LocationInfoPanelSerializer(serializers.ModelSerializer):
 # Note: Full reviews are available via /api/locations/{id}/reviews/ endpoint    #
 # ----------------------------------------------------------------------------- #
 class LocationListSerializer(serializers.ModelSerializer):
-    added_by = serializers.SerializerMethodField()
+    added_by = UserMiniSerializer(read_only=True)
     is_favorited = serializers.SerializerMethodField()
-    verified_by = serializers.SerializerMethodField()
+    verified_by = UserMiniSerializer(read_only=True)
 
-    # Use annotations instead of nested reviews to avoid N+1 queries:
-    average_rating = serializers.SerializerMethodField()
-    review_count = serializers.SerializerMethodField()
+    # Read straight from the ViewSet's annotations (avoids nested reviews and N+1
+    # queries, and skips a per-row method call). Avg is NULL for unreviewed locations.
+    average_rating = serializers.FloatField(source='average_rating_annotated', read_only=True)
+    review_count = serializers.IntegerField(source='review_count_annotated', read_only=True)
 
 
     class Meta:
@@ -241,32 +240,16 @@ class LocationListSerializer(serializers.ModelSerializer):
                             ]
 
 
-    def get_added_by(self, obj):
-        return {
-            'id': obj.added_by.id,
-            'username': obj.added_by.username
-        } if obj.added_by else None
-
-
-    def get_average_rating(self, obj):
-        # Use annotation if available (from optimized queryset), otherwise compute
-        if hasattr(obj, 'average_rating_annotated'):
-            return obj.average_rating_annotated
-        return obj.reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
-
-
-    def get_review_count(self, obj):
-        # Use annotation if available (from optimized queryset), otherwise compute
-        if hasattr(obj, 'review_count_annotated'):
-            return obj.review_count_annotated
-        return obj.reviews.count()
-
-
     def get_is_favorited(self, obj):
         # Use annotation if available (from optimized queryset), otherwise compute
         if hasattr(obj, 'is_favorited_annotated'):
             return obj.is_favorited_annotated
 
+        # Use the user's favorite IDs if the view loaded them (one query for all rows)
+        favorite_location_ids = self.context.get('favorite_location_ids')
+        if favorite_location_ids is not None:
+            return obj.id in favorite_location_ids
+
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return FavoriteLocation.objects.filter(
@@ -276,12 +259,3 @@ class LocationListSerializer(serializers.ModelSerializer):
 
         # Otherwise return false since no favorites:
         return False
-
-
-    def get_verified_by(self, obj):
-        if obj.verified_by:
-            return {
-                'id': obj.verified_by.id,
-                'username': obj.verified_by.username
-            }
-        return None
@@ -51,6 +51,10 @@ class ReviewCommentSerializer(serializers.ModelSerializer):
     def get_user_vote(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            # Use annotation if available (VoteService.annotate_user_vote, None = no vote)
+            if hasattr(obj, 'user_vote_annotated'):
+                return {True: 'up', False: 'down'}.get(obj.user_vote_annotated)
+
             # Use prefetched votes if available to avoid N+1 queries
             if hasattr(obj, '_prefetched_objects_cache') and 'votes' in obj._prefetched_objects_cache:
                 # Filter prefetched votes for current user
@@ -112,6 +116,10 @@ class ReviewSerializer(serializers.ModelSerializer):
     def get_user_vote(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            # Use annotation if available (VoteService.annotate_user_vote, None = no vote)
+            if hasattr(obj, 'user_vote_annotated'):
+                return {True: 'up', False: 'down'}.get(obj.user_vote_annotated)
+
             # Use prefetched votes if available to avoid N+1 queries
             if hasattr(obj, '_prefetched_objects_cache') and 'votes' in obj._prefetched_objects_cache:
                 # Filter prefetched votes for current user
@@ -8,6 +8,7 @@
 # Key Features:                                                                                         #
 # - UserSerializer: Core Django User model with nested profile data                                     #
 # - UserProfileSerializer: Profile picture with URL generation                                          #
+# - UserMiniSerializer: Just id and username, for nesting users in other responses                      #
 # - Profile picture URLs: Provides absolute URLs for image display                                      #
 # ----------------------------------------------------------------------------------------------------- #
 
@@ -37,3 +38,13 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'profile']
         read_only_fields = ['id', 'username', 'date_joined']
+
+
+
+# Minimal user representation (id, username) for nesting in other serializers:
+class UserMiniSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+        read_only_fields = fields
@@ -19,6 +19,7 @@
 # - Centralizes external API calls for easier maintenance                                               #
 # ----------------------------------------------------------------------------------------------------- #
 
+from .email_event_service import EmailEventService
 from .location_service import LocationService
 from .password_service import PasswordService
 from .report_service import ReportService
@@ -0,0 +1,260 @@
+# ----------------------------------------------------------------------------------------------------- #
+# This email_event_service.py file handles AWS SES bounce and complaint notification processing:        #
+#                                                                                                       #
+# Purpose:                                                                                              #
+# Provides centralized business logic for turning SES notifications into EmailBounce, EmailComplaint,   #
+# and EmailSuppressionList records. Shared by the SNS webhook views (one notification per request)      #
+# and the SQS consumer command (up to 10 notifications per receive call).                               #
+#                                                                                                       #
+# Key Features:                                                                                         #
+# - Bounce Logic: Updates existing bounce records or creates new ones, suppresses when required         #
+# - Complaint Logic: Records complaints and suppresses the address immediately                          #
+# - Batch Support: Looks up users for a whole batch in one query and commits in one transaction         #
+#                                                                                                       #
+# Service Layer Pattern:                                                                                #
+# This service separates business logic from views, following Django best practices:                    #
+# - Models define data structure (EmailBounce, EmailComplaint, EmailSuppressionList)                    #
+# - Services define business logic (bounce/complaint handling and suppression rules)                    #
+# - Views and management commands coordinate between AWS and services                                  #
+#                                                                                                       #
+# Usage:                                                                                                #
+# - All methods are static and can be called independently                                              #
+# ----------------------------------------------------------------------------------------------------- #
+
+# Import tools:
+import logging
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from starview_app.models.email_events import EmailBounce, EmailComplaint, EmailSuppressionList
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+# Map AWS bounce types to our choices
+# AWS uses: Permanent (hard), Temporary (soft/transient), Transient (connection issues)
+BOUNCE_TYPE_MAP = {
+    'permanent': 'hard',        # Permanent failure (invalid email, domain doesn't exist)
+    'temporary': 'soft',        # Temporary failure (mailbox full, server down)
+    'transient': 'transient',   # Connection issues (throttling, timeout)
+    'undetermined': 'transient',
+}
+
+# Map AWS complaint types to our choices
+COMPLAINT_TYPE_MAP = {
+    'abuse': 'abuse',
+    'auth-failure': 'auth-failure',
+    'fraud': 'fraud',
+    'not-spam': 'not-spam',
+    'other': 'other',
+    'virus': 'virus',
+}
+
+
+class EmailEventService:
+
+    # ----------------------------------------------------------------------------- #
+    # Look up user IDs for a set of email addresses with a single query.            #
+    #                                                                               #
+    # Only (email, id) pairs are fetched since the records just need the FK.        #
+    #                                                                               #
+    # Args:     emails (iterable): Lowercased email addresses                       #
+    # Returns:  dict: email → user ID for every address that belongs to a user      #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def get_user_ids_by_email(emails):
+        emails = set(emails)
+        if not emails:
+            return {}
+        return dict(User.objects.filter(email__in=emails).values_list('email', 'id'))
+
+
+    # Extract lowercased recipient emails from an SES bounce or complaint message:
+    @staticmethod
+    def get_recipient_emails(message):
+        notification_type = message.get('notificationType')
+        if notification_type == 'Bounce':
+            recipients = message.get('bounce', {}).get('bouncedRecipients', [])
+        elif notification_type == 'Complaint':
+            recipients = message.get('complaint', {}).get('complainedRecipients', [])
+        else:
+            return []
+        return [r.get('emailAddress', '').lower() for r in recipients if r.get('emailAddress')]
+
+
+    # ----------------------------------------------------------------------------- #
+    # Process an SES bounce notification.                                           #
+    #                                                                               #
+    # Hard bounces and repeated soft bounces are added to the suppression list.     #
+    #                                                                               #
+    # Args:     message_id (str): SNS message ID (used for deduplication)           #
+    #           message (dict): Parsed SES notification (notificationType=Bounce)   #
+    #           user_ids_by_email (dict): Optional email → user ID map              #
+    # Returns:  int: Number of bounced recipients in the notification               #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def process_bounce(message_id, message, user_ids_by_email=None):
+        # Extract bounce details
+        bounce = message.get('bounce', {})
+        bounce_type = bounce.get('bounceType', 'Undetermined').lower()
+        bounce_subtype = bounce.get('bounceSubType', 'undetermined').lower().replace(' ', '_')
+        bounce_type = BOUNCE_TYPE_MAP.get(bounce_type, 'transient')
+
+        bounced_recipients = bounce.get('bouncedRecipients', [])
+        if user_ids_by_email is None:
+            user_ids_by_email = EmailEventService.get_user_ids_by_email(
+                EmailEventService.get_recipient_emails(message)
+            )
+
+        # Process each bounced recipient
+        for recipient in bounced_recipients:
+            email = recipient.get('emailAddress', '').lower()
+            if not email:
+                continue
+
+            # Check for existing bounce record
+            existing_bounce = EmailBounce.objects.filter(email=email).first()
+
+            if existing_bounce:
+                # Update existing record
+                existing_bounce.bounce_count += 1
+                existing_bounce.bounce_type = bounce_type
+                existing_bounce.bounce_subtype = bounce_subtype
+                existing_bounce.diagnostic_code = recipient.get('diagnosticCode', '')
+                existing_bounce.sns_message_id = message_id
+                existing_bounce.raw_notification = message
+                existing_bounce.save()
+
+                logger.info(f"Updated bounce record for {email}: {existing_bounce.bounce_count}x")
+                bounce_record = existing_bounce
+            else:
+                # Create new bounce record
+                bounce_record = EmailBounce.objects.create(
+                    email=email,
+                    user_id=user_ids_by_email.get(email),
+                    bounce_type=bounce_type,
+                    bounce_subtype=bounce_subtype,
+                    bounce_count=1,
+                    sns_message_id=message_id,
+                    diagnostic_code=recipient.get('diagnosticCode', ''),
+                    raw_notification=message,
+                )
+
+                logger.info(f"Created bounce record for {email}: {bounce_type}")
+
+            # Check if should suppress
+            if bounce_record.should_suppress() and not bounce_record.suppressed:
+                # Add to suppression list
+                reason = 'hard_bounce' if bounce_type == 'hard' else 'soft_bounce'
+                EmailSuppressionList.add_to_suppression(
+                    email=email,
+                    reason=reason,
+                    bounce=bounce_record,
+                    notes=f"Auto-suppressed after {bounce_record.bounce_count} {bounce_type} bounce(s)"
+                )
+
+                # Mark bounce as suppressed
+                bounce_record.suppressed = True
+                bounce_record.save()
+
+                logger.warning(f"Email suppressed due to bounces: {email} ({reason})")
+
+        return len(bounced_recipients)
+
+
+    # ----------------------------------------------------------------------------- #
+    # Process an SES complaint notification.                                        #
+    #                                                                               #
+    # Complaints are serious, so every complained address is suppressed at once.    #
+    #                                                                               #
+    # Args:     message_id (str): SNS message ID (used for deduplication)           #
+    #           message (dict): Parsed SES notification (notificationType=Complaint)#
+    #           user_ids_by_email (dict): Optional email → user ID map              #
+    # Returns:  int: Number of complained recipients in the notification            #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def process_complaint(message_id, message, user_ids_by_email=None):
+        # Extract complaint details
+        complaint = message.get('complaint', {})
+        complaint_feedback_type = complaint.get('complaintFeedbackType', 'other')
+        user_agent = complaint.get('userAgent', '')
+        complaint_type = COMPLAINT_TYPE_MAP.get(complaint_feedback_type, 'other')
+
+        complained_recipients = complaint.get('complainedRecipients', [])
+        if user_ids_by_email is None:
+            user_ids_by_email = EmailEventService.get_user_ids_by_email(
+                EmailEventService.get_recipient_emails(message)
+            )
+
+        # Process each complained recipient
+        for recipient in complained_recipients:
+            email = recipient.get('emailAddress', '').lower()
+            if not email:
+                continue
+
+            # Create complaint record
+            complaint_record = EmailComplaint.objects.create(
+                email=email,
+                user_id=user_ids_by_email.get(email),
+                complaint_type=complaint_type,
+                user_agent=user_agent,
+                sns_message_id=message_id,
+                feedback_id=complaint.get('feedbackId', ''),
+                raw_notification=message,
+            )
+
+            logger.warning(f"Email complaint received: {email} ({complaint_type})")
+
+            # IMMEDIATELY add to suppression list (complaints are serious)
+            if not complaint_record.suppressed:
+                EmailSuppressionList.add_to_suppression(
+                    email=email,
+                    reason='complaint',
+                    complaint=complaint_record,
+                    notes=f"Auto-suppressed due to spam complaint ({complaint_type})"
+                )
+
+                # Mark complaint as suppressed
+                complaint_record.suppressed = True
+                complaint_record.save()
+
+                logger.critical(f"Email suppressed due to complaint: {email}")
+
+        return len(complained_recipients)
+
+
+    # ----------------------------------------------------------------------------- #
+    # Process a batch of SES notifications in a single transaction.                 #
+    #                                                                               #
+    # Users for every recipient in the batch are fetched with one query instead     #
+    # of one query per recipient, and the whole batch commits at once. If any       #
+    # notification fails, the batch rolls back so the caller can retry it.          #
+    #                                                                               #
+    # Args:     notifications (list): (message_id, message dict) tuples             #
+    # Returns:  dict: Number of bounce/complaint/skipped notifications processed    #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def process_batch(notifications):
+        results = {'bounces': 0, 'complaints': 0, 'skipped': 0}
+
+        # Resolve every recipient's user up front (one query for the whole batch)
+        user_ids_by_email = EmailEventService.get_user_ids_by_email(
+            email
+            for _, message in notifications
+            for email in EmailEventService.get_recipient_emails(message)
+        )
+
+        with transaction.atomic():
+            for message_id, message in notifications:
+                notification_type = message.get('notificationType')
+                if notification_type == 'Bounce':
+                    EmailEventService.process_bounce(message_id, message, user_ids_by_email)
+                    results['bounces'] += 1
+                elif notification_type == 'Complaint':
+                    EmailEventService.process_complaint(message_id, message, user_ids_by_email)
+                    results['complaints'] += 1
+                else:
+                    logger.warning(f"Unexpected notification type: {notification_type}")
+                    results['skipped'] += 1
+
+        return results
@@ -3,7 +3,7 @@
 #                                                                                                       #
 # 1. Address Enrichment → Fetches city, state/region, and country from coordinates                      #
 # 2. Elevation Data → Retrieves elevation in meters from Mapbox terrain API                             #
-# 3. Initialization → Orchestrates all enrichment operations when a location is created                 #
+# 3. Initialization → Fetches address and elevation concurrently and saves both in one UPDATE           #
 #                                                                                                       #
 # Data Flow:                                                                                            #
 # User creates location with coordinates → LocationService enriches with address and elevation →        #
@@ -18,6 +18,8 @@
 # External API Dependencies:                                                                            #
 # - Mapbox Geocoding API: Reverse geocoding for addresses                                               #
 # - Mapbox Tilequery API: Terrain elevation data                                                        #
+# - Requests share one pooled session per process, so keep-alive connections (and TLS sessions) to      #
+#   api.mapbox.com are reused across enrichments instead of reconnecting for every request              #
 # - Can be disabled via settings.DISABLE_EXTERNAL_APIS for testing                                      #
 #                                                                                                       #
 # Usage:                                                                                                #
@@ -28,8 +30,15 @@
 
 # Import tools:
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 
+# Mapbox responses worth retrying later (rate limited or server-side failures):
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Shared by every Mapbox request in this process (requests' connection pool is thread-safe):
+MAPBOX_SESSION = requests.Session()
+
 
 class LocationService:
 
@@ -46,18 +55,27 @@ class LocationService:
     #                                                                               #
     # Args:   url (str): The Mapbox API URL to request                              #
     # Returns: Response JSON data if successful, None otherwise                     #
+    # Raises:  RequestException: Transient failures (timeout, connection error,     #
+    #          429/5xx response), so callers can retry later                        #
     #                                                                               #
     # Security: 10-second timeout prevents hanging on slow/unresponsive API         #
     # ----------------------------------------------------------------------------- #
     @staticmethod
     def _make_mapbox_request(url):
         try:
-            response = requests.get(url, timeout=10)
+            response = MAPBOX_SESSION.get(url, timeout=10)
             response.raise_for_status()
             return response.json()
 
-        except requests.exceptions.Timeout as e:
-            # Error: Mapbox API request timed out after 10 seconds
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            # Transient: Mapbox API timed out after 10 seconds or couldn't be reached
+            raise
+
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code in RETRYABLE_STATUS_CODES:
+                # Transient: rate limited or Mapbox server error
+                raise
+            # Error: Mapbox API rejected the request: {error}
             return None
 
         except requests.exceptions.RequestException as e:
@@ -76,9 +94,9 @@ class LocationService:
     #                                                                                                   #
     # ------------------------------------------------------------------------------------------------- #
 
-    # Updates address fields using Mapbox reverse geocoding:
+    # Fetches address components from Mapbox reverse geocoding (no database access):
     @staticmethod
-    def update_address_from_coordinates(location):
+    def fetch_address_components(location):
         mapbox_token = settings.MAPBOX_TOKEN
 
         url = (f"https://api.mapbox.com/geocoding/v5/mapbox.places/"
@@ -88,36 +106,24 @@ class LocationService:
         data = LocationService._make_mapbox_request(url)
         if not data or not data.get('features'):
             # Warning: No address data found for location: {location.name}
-            return False
+            return None
 
         # Process the response to extract address components
+        components = {}
         for feature in data['features']:
             if 'place_type' in feature:
                 if 'country' in feature['place_type']:
-                    location.country = feature['text']
+                    components['country'] = feature['text']
                 elif 'region' in feature['place_type']:
-                    location.administrative_area = feature['text']
+                    components['administrative_area'] = feature['text']
                 elif 'place' in feature['place_type']:
-                    location.locality = feature['text']
-
-        # Create formatted address
-        address_parts = [
-            part for part in [location.locality, location.administrative_area, location.country]
-            if part
-        ]
-
-        location.formatted_address = ", ".join(address_parts)
-        location.save(update_fields=[
-            'formatted_address', 'administrative_area', 'locality', 'country'
-        ])
-
-        # Info: Updated address for {location.name}: {location.formatted_address}
-        return True
+                    components['locality'] = feature['text']
+        return components
 
 
-    # Updates elevation using Mapbox Tilequery API:
+    # Fetches elevation in meters from the Mapbox Tilequery API (no database access):
     @staticmethod
-    def update_elevation_from_mapbox(location):
+    def fetch_elevation(location):
         mapbox_token = settings.MAPBOX_TOKEN
 
         url = (f"https://api.mapbox.com/v4/mapbox.mapbox-terrain-v2/tilequery/"
@@ -127,7 +133,7 @@ class LocationService:
         data = LocationService._make_mapbox_request(url)
         if not data or not data.get('features'):
             # Warning: No elevation data found for location: {location.name}
-            return False
+            return None
 
         # Extract elevation from features
         elevation = next(
@@ -139,31 +145,120 @@ class LocationService:
 
         if elevation is None:
             # Warning: No elevation property found for location: {location.name}
+            return None
+        return float(elevation)
+
+
+    # Sets address components and rebuilds formatted_address (returns the fields to save):
+    @staticmethod
+    def apply_address_components(location, components):
+        for field, value in components.items():
+            setattr(location, field, value)
+
+        # Create formatted address
+        address_parts = [
+            part for part in [location.locality, location.administrative_area, location.country]
+            if part
+        ]
+
+        location.formatted_address = ", ".join(address_parts)
+        return ['formatted_address', 'administrative_area', 'locality', 'country']
+
+
+    # Updates address fields using Mapbox reverse geocoding:
+    @staticmethod
+    def update_address_from_coordinates(location):
+        try:
+            components = LocationService.fetch_address_components(location)
+        except requests.exceptions.RequestException:
+            # Warning: Mapbox unavailable, address not updated for {location.name}
+            return False
+        if components is None:
             return False
 
-        location.elevation = float(elevation)
+        location.save(update_fields=LocationService.apply_address_components(location, components))
+        # Info: Updated address for {location.name}: {location.formatted_address}
+        return True
+
+
+    # Updates elevation using Mapbox Tilequery API:
+    @staticmethod
+    def update_elevation_from_mapbox(location):
+        try:
+            elevation = LocationService.fetch_elevation(location)
+        except requests.exceptions.RequestException:
+            # Warning: Mapbox unavailable, elevation not updated for {location.name}
+            return False
+        if elevation is None:
+            return False
+
+        location.elevation = elevation
         location.save(update_fields=['elevation'])
         # Info: Updated elevation for {location.name} to {location.elevation}m
         return True
 
 
-    # Initialize all location data after creation:
+    # ----------------------------------------------------------------------------- #
+    # Fetches address and elevation concurrently and saves both in one UPDATE.      #
+    #                                                                               #
+    # The two Mapbox requests are independent, so they run on two threads and the   #
+    # enrichment takes as long as the slower one instead of the sum. The threads    #
+    # only do HTTP; the save happens on the calling thread (and its connection).    #
+    #                                                                               #
+    # Args:   location (Location): Location to enrich                               #
+    #         raise_transient (bool): Re-raise a transient Mapbox failure (after    #
+    #         saving the part that succeeded) so a task can retry                   #
+    # Returns: list: Enriched parts ('address', 'elevation'), empty if both failed  #
+    # ----------------------------------------------------------------------------- #
     @staticmethod
-    def initialize_location_data(location):
-        if getattr(settings, 'DISABLE_EXTERNAL_APIS', False):
-            # Info: Skipping external API calls for {location.name} (APIs disabled)
-            return
+    def enrich_location(location, raise_transient=False):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            address_future = executor.submit(LocationService.fetch_address_components, location)
+            elevation_future = executor.submit(LocationService.fetch_elevation, location)
+
+        enriched = []
+        update_fields = []
+        transient_error = None
 
-        # Update address from coordinates
         try:
-            LocationService.update_address_from_coordinates(location)
+            components = address_future.result()
+            if components is not None:
+                update_fields += LocationService.apply_address_components(location, components)
+                enriched.append('address')
+        except requests.exceptions.RequestException as e:
+            # Warning: Mapbox unavailable, could not update address for {location.name}: {error}
+            transient_error = e
         except Exception as e:
             # Warning: Could not update address for {location.name}: {error}
             pass
 
-        # Update elevation from Mapbox
         try:
-            LocationService.update_elevation_from_mapbox(location)
+            elevation = elevation_future.result()
+            if elevation is not None:
+                location.elevation = elevation
+                update_fields.append('elevation')
+                enriched.append('elevation')
+        except requests.exceptions.RequestException as e:
+            # Warning: Mapbox unavailable, could not update elevation for {location.name}: {error}
+            transient_error = transient_error or e
         except Exception as e:
             # Warning: Could not update elevation for {location.name}: {error}
-            pass
\ No newline at end of file
+            pass
+
+        if update_fields:
+            location.save(update_fields=update_fields)
+
+        if raise_transient and transient_error is not None:
+            raise transient_error
+        return enriched
+
+
+    # Initialize all location data after creation:
+    @staticmethod
+    def initialize_location_data(location):
+        if getattr(settings, 'DISABLE_EXTERNAL_APIS', False):
+            # Info: Skipping external API calls for {location.name} (APIs disabled)
+            return
+
+        # Update address and elevation (concurrently, one save)
+        LocationService.enrich_location(location)
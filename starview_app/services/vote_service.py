@@ -8,7 +8,7 @@
 # Key Features:                                                                                         #
 # - Toggle Logic: Same vote removes it, different vote changes it                                       #
 # - Generic Support: Works with any content type via ContentTypes framework                             #
-# - Aggregate Calculation: Returns updated vote counts in a single operation                            #
+# - Vote Counters: Reads counts from stored Review/ReviewComment counters instead of counting votes     #
 # - Business Rules: Centralizes vote validation and toggle behavior                                     #
 #                                                                                                       #
 # Service Layer Pattern:                                                                                #
@@ -24,8 +24,17 @@
 
 # Import tools:
 from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from rest_framework.exceptions import ValidationError
 from starview_app.models.model_vote import Vote
 
+# Map request vote types to Vote.is_upvote:
+VOTE_TYPE_MAP = {'up': True, 'down': False}
+
+# Counter columns on voted models (Review, ReviewComment), kept in sync by Vote signals:
+COUNTER_FIELDS = ['upvote_count', 'downvote_count']
+
 
 class VoteService:
 
@@ -40,28 +49,71 @@ class VoteService:
     # Args:     user (User): The user casting the vote                              #
     #           content_object: The object being voted on (Review, ReviewComment)   #
     #           vote_type (str): 'up' for upvote, 'down' for downvote               #
+    #           content_type (ContentType): Optional, looked up if not given        #
     # Returns:  dict: vote_data (upvotes, downvotes, vote_count, user_vote)         #
     # Raises:   ValidationError: If validation fails                                #
     # ----------------------------------------------------------------------------- #
     @staticmethod
-    def handle_vote_request(user, content_object, vote_type):
-        from rest_framework.exceptions import ValidationError
-
-        # Validate vote type
-        if vote_type not in ['up', 'down']:
+    def handle_vote_request(user, content_object, vote_type, content_type=None):
+        # Validate vote type (JSON bodies can send any type, so only look up strings)
+        is_upvote = VOTE_TYPE_MAP.get(vote_type) if isinstance(vote_type, str) else None
+        if is_upvote is None:
             raise ValidationError('Vote type must be "up" or "down"')
 
-        # Prevent users from voting on their own content
-        if hasattr(content_object, 'user') and content_object.user == user:
+        # Prevent users from voting on their own content (compare IDs so the
+        # author doesn't have to be loaded through the FK)
+        owner_id = getattr(content_object, 'user_id', None)
+        if owner_id is not None and owner_id == user.id:
             raise ValidationError('You cannot vote on your own content')
 
         # Process the vote
-        is_upvote = vote_type == 'up'
-        vote_data = VoteService.toggle_vote(user, content_object, is_upvote)
+        vote_data = VoteService.toggle_vote(user, content_object, is_upvote, content_type)
 
         return vote_data
 
 
+    # ----------------------------------------------------------------------------- #
+    # Count up and down votes for an object in a single aggregate query.            #
+    #                                                                               #
+    # Args:     content_type (ContentType): Content type of the voted object        #
+    #           object_id (int): Primary key of the voted object                    #
+    # Returns:  tuple: (upvotes, downvotes)                                         #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def count_votes(content_type, object_id):
+        counts = Vote.objects.filter(
+            content_type=content_type,
+            object_id=object_id
+        ).aggregate(
+            upvotes=Count('pk', filter=Q(is_upvote=True)),
+            downvotes=Count('pk', filter=Q(is_upvote=False))
+        )
+        return counts['upvotes'], counts['downvotes']
+
+
+    # ----------------------------------------------------------------------------- #
+    # Get up and down votes for an object, preferring its stored counters.          #
+    #                                                                               #
+    # Counted models are read from their columns (no query unless refresh=True,     #
+    # which re-reads just the two counters after a vote changed them). Other        #
+    # models fall back to count_votes().                                            #
+    #                                                                               #
+    # Args:     content_type (ContentType): Content type of the voted object        #
+    #           content_object: The voted object                                    #
+    #           refresh (bool): Reload the counters from the database first         #
+    # Returns:  tuple: (upvotes, downvotes)                                         #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def get_counters(content_type, content_object, refresh=False):
+        concrete_fields = {field.name for field in content_object._meta.concrete_fields}
+        if not concrete_fields.issuperset(COUNTER_FIELDS):
+            return VoteService.count_votes(content_type, content_object.id)
+
+        if refresh:
+            content_object.refresh_from_db(fields=COUNTER_FIELDS)
+        return content_object.upvote_count, content_object.downvote_count
+
+
     # ----------------------------------------------------------------------------- #
     # Toggle a user's vote on any content object (review, comment, etc.).           #
     #                                                                               #
@@ -73,49 +125,44 @@ class VoteService:
     # Args:     user (User): The user casting the vote                              #
     #           content_object: The object being voted on (Review, ReviewComment)   #
     #           is_upvote (bool): True for upvote, False for downvote               #
+    #           content_type (ContentType): Optional, looked up if not given        #
     # Returns:  dict: vote_data (upvotes, downvotes, vote_count, user_vote)         #
     # ----------------------------------------------------------------------------- #
     @staticmethod
-    def toggle_vote(user, content_object, is_upvote):
-        # Get the ContentType for the content object
-        content_type = ContentType.objects.get_for_model(content_object)
+    def toggle_vote(user, content_object, is_upvote, content_type=None):
+        # Get the ContentType for the content object (by class, hits the per-model cache)
+        content_type = content_type or ContentType.objects.get_for_model(type(content_object))
 
-        # Get or create the vote
-        vote, created = Vote.objects.get_or_create(
-            user=user,
-            content_type=content_type,
-            object_id=content_object.id,
-            defaults={'is_upvote': is_upvote}
-        )
+        # Vote row and counter update (Vote signals) commit together
+        with transaction.atomic():
+            # Get or create the vote, locking an existing row so concurrent toggles
+            # by the same user are applied one after another
+            vote, created = Vote.objects.select_for_update().get_or_create(
+                user=user,
+                content_type=content_type,
+                object_id=content_object.id,
+                defaults={'is_upvote': is_upvote}
+            )
 
-        user_vote = None
-        if not created:
-            # Vote already exists
-            if vote.is_upvote == is_upvote:
-                # Same vote type - remove the vote (toggle off)
-                vote.delete()
-                user_vote = None
+            user_vote = None
+            if not created:
+                # Vote already exists
+                if vote.is_upvote == is_upvote:
+                    # Same vote type - remove the vote (toggle off)
+                    vote.delete()
+                    user_vote = None
+                else:
+                    # Different vote type - update the vote (single-column UPDATE; save()
+                    # rather than queryset.update() so the counter signal still fires)
+                    vote.is_upvote = is_upvote
+                    vote.save(update_fields=['is_upvote'])
+                    user_vote = 'up' if is_upvote else 'down'
             else:
-                # Different vote type - update the vote
-                vote.is_upvote = is_upvote
-                vote.save()
+                # New vote created
                 user_vote = 'up' if is_upvote else 'down'
-        else:
-            # New vote created
-            user_vote = 'up' if is_upvote else 'down'
-
-        # Calculate updated vote counts
-        upvotes = Vote.objects.filter(
-            content_type=content_type,
-            object_id=content_object.id,
-            is_upvote=True
-        ).count()
 
-        downvotes = Vote.objects.filter(
-            content_type=content_type,
-            object_id=content_object.id,
-            is_upvote=False
-        ).count()
+            # Read the updated vote counters
+            upvotes, downvotes = VoteService.get_counters(content_type, content_object, refresh=True)
 
         vote_count = upvotes - downvotes
 
@@ -135,47 +182,32 @@ class VoteService:
     #                                                                               #
     # Args:     content_object: The object to get vote counts for                   #
     #           user (User): Optional user to check their vote status               #
+    #           content_type (ContentType): Optional, looked up if not given        #
     # Returns:  dict: Contains upvotes, downvotes, vote_count, user_vote            #
     # ----------------------------------------------------------------------------- #
     @staticmethod
-    def get_vote_counts(content_object, user=None):
-        try:
-            content_type = ContentType.objects.get_for_model(content_object)
+    def get_vote_counts(content_object, user=None, content_type=None):
+        content_type = content_type or ContentType.objects.get_for_model(type(content_object))
 
-            upvotes = Vote.objects.filter(
-                content_type=content_type,
-                object_id=content_object.id,
-                is_upvote=True
-            ).count()
-
-            downvotes = Vote.objects.filter(
-                content_type=content_type,
-                object_id=content_object.id,
-                is_upvote=False
-            ).count()
-
-            vote_count = upvotes - downvotes
+        # Only the database reads can fail here; anything else is a bug and propagates
+        try:
+            upvotes, downvotes = VoteService.get_counters(content_type, content_object)
 
-            # Check user's vote if user provided
+            # Check user's vote if user provided (annotate_user_vote() saves the query)
             user_vote = None
-            if user and user.is_authenticated:
-                vote = Vote.objects.filter(
-                    content_type=content_type,
-                    object_id=content_object.id,
-                    user=user
-                ).first()
-
-                if vote:
-                    user_vote = 'up' if vote.is_upvote else 'down'
+            if user and user.is_authenticated and hasattr(content_object, 'user_vote_annotated'):
+                user_vote = VoteService.vote_label(content_object.user_vote_annotated)
+            elif user and user.is_authenticated:
+                # Only the vote direction is needed, so skip loading the Vote row
+                user_vote = VoteService.vote_label(
+                    Vote.objects.filter(
+                        content_type=content_type,
+                        object_id=content_object.id,
+                        user=user
+                    ).values_list('is_upvote', flat=True).first()
+                )
 
-            return {
-                'upvotes': upvotes,
-                'downvotes': downvotes,
-                'vote_count': vote_count,
-                'user_vote': user_vote
-            }
-
-        except Exception as e:
+        except DatabaseError as e:
             return {
                 'upvotes': 0,
                 'downvotes': 0,
@@ -183,3 +215,88 @@ class VoteService:
                 'user_vote': None,
                 'error': str(e)
             }
+
+        return {
+            'upvotes': upvotes,
+            'downvotes': downvotes,
+            'vote_count': upvotes - downvotes,
+            'user_vote': user_vote
+        }
+
+
+    # Convert a stored is_upvote value into 'up', 'down', or None (no vote):
+    @staticmethod
+    def vote_label(is_upvote):
+        if is_upvote is None:
+            return None
+        return 'up' if is_upvote else 'down'
+
+
+    # ----------------------------------------------------------------------------- #
+    # Annotate a queryset of voted objects with the user's vote on each row.        #
+    #                                                                               #
+    # Adds user_vote_annotated (True/False, or None when the user hasn't voted)     #
+    # from a correlated subquery, so list views don't need to prefetch every vote   #
+    # of every row just to find the current user's. Vote counts are stored          #
+    # columns and need no annotation.                                               #
+    #                                                                               #
+    # Args:     queryset (QuerySet): Review or ReviewComment queryset               #
+    #           user (User): The requesting user (anonymous users are skipped)      #
+    # Returns:  QuerySet: The annotated queryset                                    #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def annotate_user_vote(queryset, user):
+        if not user or not user.is_authenticated:
+            return queryset
+
+        content_type = ContentType.objects.get_for_model(queryset.model)
+        return queryset.annotate(
+            user_vote_annotated=Subquery(
+                Vote.objects.filter(
+                    content_type=content_type,
+                    object_id=OuterRef('pk'),
+                    user_id=user.id
+                ).values('is_upvote')[:1]
+            )
+        )
+
+
+    # ----------------------------------------------------------------------------- #
+    # Recompute a counted model's vote counters from the Vote table in bulk.        #
+    #                                                                               #
+    # One grouped aggregate covers every voted row, written back with batched       #
+    # bulk_update() instead of a save() per object. Rows that still have non-zero   #
+    # counters but no votes are reset with a single UPDATE.                         #
+    #                                                                               #
+    # Args:     model: Counted model class (Review or ReviewComment)                #
+    #           batch_size (int): Rows per bulk_update() statement                  #
+    # Returns:  int: Number of rows written                                         #
+    # ----------------------------------------------------------------------------- #
+    @staticmethod
+    def recompute_counters(model, batch_size=1000):
+        content_type = ContentType.objects.get_for_model(model)
+        votes = Vote.objects.filter(content_type=content_type)
+        counts = votes.values('object_id').annotate(
+            upvotes=Count('pk', filter=Q(is_upvote=True)),
+            downvotes=Count('pk', filter=Q(is_upvote=False)),
+        )
+        counts_by_id = {row['object_id']: (row['upvotes'], row['downvotes']) for row in counts}
+
+        # Votes can outlive a deleted object (no FK), so only update rows that exist
+        objects = [
+            model(pk=pk, upvote_count=upvotes, downvote_count=downvotes)
+            for pk, (upvotes, downvotes) in counts_by_id.items()
+        ]
+        existing_ids = set(model.objects.filter(pk__in=votes.values('object_id')).values_list('pk', flat=True))
+        updated = model.objects.bulk_update(
+            [obj for obj in objects if obj.pk in existing_ids],
+            COUNTER_FIELDS,
+            batch_size=batch_size,
+        )
+
+        # Reset counters on rows that no longer have any votes
+        updated += model.objects.exclude(pk__in=votes.values('object_id')).filter(
+            Q(upvote_count__gt=0) | Q(downvote_count__gt=0)
+        ).update(upvote_count=0, downvote_count=0)
+
+        return updated
@@ -58,10 +58,16 @@ reviews_router = routers.NestedDefaultRouter(locations_router, r'reviews', looku
 reviews_router.register(r'comments', CommentViewSet, basename='review-comments')
 
 
+# Patterns are matched in order, so the most requested routes come first:
 urlpatterns = [
     # Health check (for load balancer monitoring):
     path('health/', health_check, name='health_check'),
 
+    # Django Rest Framework API endpoints (no router prefix overlaps api/auth/):
+    path('api/', include(router.urls)),
+    path('api/', include(locations_router.urls)),
+    path('api/', include(reviews_router.urls)),
+
     # User authentication API endpoints:
     path('api/auth/register/', register, name='register'),
     path('api/auth/login/', custom_login, name='login'),
@@ -70,9 +76,4 @@ urlpatterns = [
     path('api/auth/resend-verification/', resend_verification_email, name='resend_verification'),
     path('api/auth/password-reset/', request_password_reset, name='password_reset_request'),
     path('api/auth/password-reset-confirm/<uidb64>/<token>/', confirm_password_reset, name='password_reset_confirm'),
-
-    # Django Rest Framework API endpoints:
-    path('api/', include(router.urls)),
-    path('api/', include(locations_router.urls)),
-    path('api/', include(reviews_router.urls)),
 ]
\ No newline at end of file
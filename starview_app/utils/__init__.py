@@ -17,7 +17,10 @@
 # - throttles.py: DRF rate limiting classes (login, content creation, voting, reporting)                #
 # - cache.py: Redis caching utilities (key generation, invalidation helpers)                            #
 # - audit_logger.py: Security audit logging (authentication events, admin actions)                      #
+# - audit_queue.py: Background batched AuditLog inserts (enabled by AUDIT_LOG_BATCHING)                 #
 # - exception_handler.py: Global exception handler for consistent error responses (Phase 4)             #
+# - renderers.py: orjson-based JSON renderer used for all API responses                                 #
+# - pagination.py: Paginator that estimates counts for very large tables (admin changelists)            #
 # - signals.py: Django signal handlers (file cleanup, aggregate updates)                                #
 #                                                                                                       #
 # Note on signals.py:                                                                                   #
@@ -49,6 +52,7 @@ from .throttles import (
 from .cache import (
     location_list_key,
     location_detail_key,
+    location_info_panel_key,
     map_markers_key,
     review_list_key,
     user_favorites_key,
@@ -68,6 +72,7 @@ from .audit_logger import (
     log_permission_denied,
     get_client_ip,
     get_user_agent,
+    get_request_context,
 )
 
 # Import exception handler
@@ -95,6 +100,7 @@ __all__ = [
     # Cache utilities
     'location_list_key',
     'location_detail_key',
+    'location_info_panel_key',
     'map_markers_key',
     'review_list_key',
     'user_favorites_key',
@@ -112,6 +118,7 @@ __all__ = [
     'log_permission_denied',
     'get_client_ip',
     'get_user_agent',
+    'get_request_context',
 
     # Exception handler
     'custom_exception_handler',
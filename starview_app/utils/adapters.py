@@ -16,6 +16,7 @@
 # Custom view configured in django_project/urls.py to override allauth view.                            #
 # ----------------------------------------------------------------------------------------------------- #
 
+import secrets
 from allauth.account.adapter import DefaultAccountAdapter
 from allauth.account.views import ConfirmEmailView
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
@@ -25,6 +26,7 @@ from django.http import HttpResponseRedirect
 from django.http import Http404
 from django.views.generic import View
 from django.contrib.auth.models import User
+from django.conf import settings
 
 
 # ----------------------------------------------------------------------------- #
@@ -51,10 +53,7 @@ class CustomAccountAdapter(DefaultAccountAdapter):
     #   - str: URL to redirect to after email verification                          #
     # ----------------------------------------------------------------------------- #
     def get_email_verification_redirect_url(self, email_address):
-        import secrets
-        from django.conf import settings
-
-        # Generate a one-time success token
+        # Generate a one-time success token (the React page only renders with one)
         success_token = secrets.token_urlsafe(16)
 
         # In development, redirect to React dev server
@@ -77,8 +76,6 @@ class CustomAccountAdapter(DefaultAccountAdapter):
     #   - str: URL to redirect to after login                                       #
     # ----------------------------------------------------------------------------- #
     def get_login_redirect_url(self, request):
-        from django.conf import settings
-
         # Check if this is a social account connection (not initial login)
         process = request.GET.get('process')
         if process == 'connect':
@@ -115,7 +112,6 @@ class CustomAccountAdapter(DefaultAccountAdapter):
     #   - str: URL to redirect to after logout                                      #
     # ----------------------------------------------------------------------------- #
     def get_logout_redirect_url(self, request):
-        from django.conf import settings
         if settings.DEBUG:
             return 'http://localhost:5173/'
         return '/'
@@ -133,7 +129,6 @@ class CustomAccountAdapter(DefaultAccountAdapter):
     #   - str: URL to redirect to after signup                                      #
     # ----------------------------------------------------------------------------- #
     def get_signup_redirect_url(self, request):
-        from django.conf import settings
         if settings.DEBUG:
             return 'http://localhost:5173/'
         return '/'
@@ -159,7 +154,6 @@ class CustomAccountAdapter(DefaultAccountAdapter):
 class CustomConfirmEmailView(ConfirmEmailView):
 
     def get(self, *args, **kwargs):
-        from django.conf import settings
         from allauth.account.models import EmailAddress
 
         try:
@@ -253,8 +247,6 @@ class CustomConfirmEmailView(ConfirmEmailView):
 class CustomConnectionsView(View):
 
     def get(self, request, *args, **kwargs):
-        from django.conf import settings
-
         # Redirect to React profile page with success message
         profile_url = '/profile?social_connected=true'
         if settings.DEBUG:
@@ -265,7 +257,6 @@ class CustomConnectionsView(View):
     def post(self, request, *args, **kwargs):
         # Handle disconnect POST requests by delegating to default view
         # then redirecting back to profile
-        from django.conf import settings
 
         # Process the disconnect
         view = ConnectionsView.as_view()
@@ -335,7 +326,6 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
             from django.template.loader import render_to_string
             from django.core.mail import EmailMultiAlternatives
             from django.contrib.sites.shortcuts import get_current_site
-            from django.conf import settings
 
             # Get site information
             current_site = get_current_site(request)
@@ -368,7 +358,6 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
         1. User is logged in and trying to CONNECT a social account (from Profile page)
         2. User is NOT logged in and trying to LOGIN with social account
         """
-        from django.conf import settings
         from allauth.socialaccount.models import SocialAccount
 
         # Get the provider and UID from the social account being linked
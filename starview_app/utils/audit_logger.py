@@ -7,17 +7,21 @@
 #                                                                                                       #
 # Key Features:                                                                                         #
 # - Dual storage: Writes to both database and log file simultaneously                                   #
+# - Optional batching: AUDIT_LOG_BATCHING queues database rows for bulk inserts (audit_queue.py)        #
 # - Automatic context capture: Extracts IP address, user agent from request                             #
 # - Proxy-aware IP extraction: Handles X-Forwarded-For header for reverse proxies                       #
 # - Thread-safe: Safe to use in multi-threaded environments                                             #
 # - Flexible metadata: Accepts arbitrary JSON-serializable metadata                                     #
+# - Off switch: AUDIT_LOG_ENABLED=False makes every log_* call return None without doing any work       #
 #                                                                                                       #
 # Functions:                                                                                            #
 # - log_auth_event(): Log authentication events (login, logout, password change)                        #
 # - log_admin_action(): Log admin/staff actions (location verification, moderation)                     #
 # - log_permission_denied(): Log unauthorized access attempts                                           #
+# - write_audit_event(): Shared writer behind the log_* functions (one payload for database and file)   #
 # - get_client_ip(): Extract client IP address from request (handles proxies)                           #
 # - get_user_agent(): Extract user agent string from request                                            #
+# - get_request_context(): IP address and user agent for a request, cached on the request               #
 #                                                                                                       #
 # Usage Example:                                                                                        #
 #   from starview_app.utils.audit_logger import log_auth_event                                             #
@@ -39,19 +43,71 @@
 
 # Import tools:
 import logging
-import json
+import orjson
+from functools import lru_cache
+from django.conf import settings
 from django.utils.timezone import now
 from django.apps import apps
+from django.core.cache import cache
+from . import audit_queue
+from .cache import permission_denied_key
 
 # Get the audit logger configured in settings.py:
 logger = logging.getLogger('audit')
 
 
-# Lazy-load AuditLog model to avoid circular import:
+# Lazy-load AuditLog model to avoid circular import (looked up once, then cached):
+@lru_cache(maxsize=1)
 def get_audit_log_model():
     return apps.get_model('starview_app', 'AuditLog')
 
 
+# Repeat denials from the same IP for the same resource within this many seconds are only written to the
+# log file, so a scanner hammering protected URLs can't flood the AuditLog table:
+PERMISSION_DENIED_DEDUP_WINDOW = 60
+
+
+# Longest user agent stored (real ones are ~100-300 chars; broken clients send several KB):
+USER_AGENT_MAX_LENGTH = 512
+
+
+# Payload fields copied into each log file entry ('username' is written as 'user'):
+FILE_LOG_FIELDS = ('event_type', 'username', 'ip_address', 'success', 'message', 'metadata')
+
+
+# Encode a log file entry with orjson (faster than json.dumps; output is UTF-8, not ASCII-escaped):
+def dump_log_data(log_data):
+    return orjson.dumps(log_data, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# ----------------------------------------------------------------------------- #
+# Count a permission denial for an (IP, resource) pair within the dedup window. #
+#                                                                               #
+# Args:     ip_address (str): Client IP address                                 #
+#           resource (str): Resource/URL that was denied                        #
+# Returns:  int: Earlier denials in the current window (0 for the first one)    #
+# ----------------------------------------------------------------------------- #
+def count_repeat_denial(ip_address, resource):
+    key = permission_denied_key(ip_address, resource)
+    if cache.add(key, 0, PERMISSION_DENIED_DEDUP_WINDOW):
+        return 0
+
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key expired between add() and incr(); treat as a new window
+        return 0
+
+
+# Save an AuditLog now, or hand it to the batched writer when AUDIT_LOG_BATCHING is on:
+def save_audit_log(audit_log):
+    if settings.AUDIT_LOG_BATCHING:
+        audit_queue.enqueue(audit_log)
+    else:
+        audit_log.save()
+    return audit_log
+
+
 # ----------------------------------------------------------------------------- #
 # Extract client IP address from request, handling reverse proxies.             #
 #                                                                               #
@@ -65,8 +121,8 @@ def get_client_ip(request):
     # Check X-Forwarded-For header (used by proxies):
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
-        # Take the first IP if multiple are present (client IP):
-        ip = x_forwarded_for.split(',')[0].strip()
+        # Take the first IP if multiple are present (client IP; partition avoids splitting the whole chain):
+        ip = x_forwarded_for.partition(',')[0].strip()
     else:
         # No proxy, use direct connection IP:
         ip = request.META.get('REMOTE_ADDR')
@@ -79,10 +135,66 @@ def get_client_ip(request):
 # Returns the User-Agent header which contains browser/client information.      #
 #                                                                               #
 # Args:     request: Django HTTP request object                                 #
-# Returns:  str: User agent string (or empty string if not present)             #
+# Returns:  str: User agent string, truncated to USER_AGENT_MAX_LENGTH          #
+#           (or empty string if not present)                                    #
 # ----------------------------------------------------------------------------- #
 def get_user_agent(request):
-    return request.META.get('HTTP_USER_AGENT', '')
+    return request.META.get('HTTP_USER_AGENT', '')[:USER_AGENT_MAX_LENGTH]
+
+
+# ----------------------------------------------------------------------------- #
+# Get the (IP address, user agent) pair for a request, computed once.           #
+#                                                                               #
+# Cached on the request so several audit events fired by the same request       #
+# (e.g. permission denied + admin action) reuse it.                             #
+#                                                                               #
+# Args:     request: Django HTTP request object (None outside a request)        #
+# Returns:  tuple: (ip_address, user_agent)                                     #
+# ----------------------------------------------------------------------------- #
+def get_request_context(request):
+    # No request (management commands, background tasks): nothing to extract
+    if request is None:
+        return None, ''
+
+    context = getattr(request, '_audit_context', None)
+    if context is None:
+        context = (get_client_ip(request), get_user_agent(request))
+        request._audit_context = context
+    return context
+
+
+# ----------------------------------------------------------------------------- #
+# Build one AuditLog payload and write it to the database and the log file.     #
+#                                                                               #
+# The file entry is a projection of the same payload (FILE_LOG_FIELDS, with     #
+# 'username' written as 'user'), plus any event-specific file_fields.           #
+#                                                                               #
+# Args:     request: Django HTTP request object (or None)                       #
+#           save (bool): False to only log to file (AuditLog is left unsaved)   #
+#           file_fields (dict): Extra keys for the file entry only (optional)   #
+#           **payload: AuditLog fields except ip_address/user_agent             #
+# Returns:  AuditLog: Created (or queued) AuditLog instance                     #
+# ----------------------------------------------------------------------------- #
+def write_audit_event(request, save=True, file_fields=None, **payload):
+    # Extract request context (cached on the request):
+    payload['ip_address'], payload['user_agent'] = get_request_context(request)
+
+    # Get AuditLog model (lazy-loaded to avoid circular import):
+    AuditLog = get_audit_log_model()
+
+    # Create database record (batched when AUDIT_LOG_BATCHING is enabled):
+    audit_log = AuditLog(**payload)
+    if save:
+        save_audit_log(audit_log)
+
+    # Log to file (JSON format):
+    log_data = {key: payload[key] for key in FILE_LOG_FIELDS}
+    log_data['user'] = log_data.pop('username') or 'anonymous'
+    if file_fields:
+        log_data.update(file_fields)
+    logger.info(dump_log_data(log_data))
+
+    return audit_log
 
 
 # ----------------------------------------------------------------------------- #
@@ -91,56 +203,34 @@ def get_user_agent(request):
 # Records authentication-related events (login, logout, registration,           #
 # password changes) with full context (user, IP, user agent, metadata).         #
 #                                                                               #
-# Args:     request: Django HTTP request object                                 #
+# Args:     request: Django HTTP request object (or None)                       #
 #           event_type (str): Event type (login_success, login_failed, etc.)    #
 #           user (User): Django User object (optional, None for failed logins)  #
 #           username (str): Username attempted (optional, for failed logins)    #
 #           success (bool): Whether the action succeeded (default: True)        #
 #           message (str): Human-readable event description                     #
 #           metadata (dict): Additional event-specific data (optional)          #
-# Returns:  AuditLog: Created AuditLog instance                                 #
+# Returns:  AuditLog: Created (or queued) AuditLog instance (None if disabled)  #
 # ----------------------------------------------------------------------------- #
 def log_auth_event(request, event_type, user=None, username='', success=True, message='', metadata=None):
-    # Extract request context:
-    ip_address = get_client_ip(request)
-    user_agent = get_user_agent(request)
+    # Audit logging switched off (AUDIT_LOG_ENABLED=False): skip all work
+    if not settings.AUDIT_LOG_ENABLED:
+        return None
 
     # Ensure username is set (from user object if available):
     if user and not username:
         username = user.username
 
-    # Ensure metadata is a dict:
-    if metadata is None:
-        metadata = {}
-
-    # Get AuditLog model (lazy-loaded to avoid circular import):
-    AuditLog = get_audit_log_model()
-
-    # Create database record:
-    audit_log = AuditLog.objects.create(
+    return write_audit_event(
+        request,
         event_type=event_type,
         user=user,
         username=username,
-        ip_address=ip_address,
-        user_agent=user_agent,
         success=success,
         message=message,
-        metadata=metadata,
+        metadata=metadata if metadata is not None else {},
     )
 
-    # Log to file (JSON format):
-    log_data = {
-        'event_type': event_type,
-        'user': username or 'anonymous',
-        'ip_address': ip_address,
-        'success': success,
-        'message': message,
-        'metadata': metadata,
-    }
-    logger.info(json.dumps(log_data))
-
-    return audit_log
-
 
 # ----------------------------------------------------------------------------- #
 # Log an admin action to database and file.                                     #
@@ -148,67 +238,49 @@ def log_auth_event(request, event_type, user=None, username='', success=True, me
 # Records privileged administrative actions (location verification, content     #
 # moderation, user management) with full context.                               #
 #                                                                               #
-# Args:     request: Django HTTP request object                                 #
+# Args:     request: Django HTTP request object (or None)                       #
 #           event_type (str): Event type (location_verified, etc.)              #
 #           user (User): Django User object performing the action               #
 #           message (str): Human-readable event description                     #
 #           metadata (dict): Additional event-specific data (optional)          #
-# Returns:  AuditLog: Created AuditLog instance                                 #
+# Returns:  AuditLog: Created (or queued) AuditLog instance (None if disabled)  #
 # ----------------------------------------------------------------------------- #
 def log_admin_action(request, event_type, user, message='', metadata=None):
-    # Extract request context:
-    ip_address = get_client_ip(request)
-    user_agent = get_user_agent(request)
-
-    # Ensure metadata is a dict:
-    if metadata is None:
-        metadata = {}
-
-    # Get AuditLog model (lazy-loaded to avoid circular import):
-    AuditLog = get_audit_log_model()
+    # Audit logging switched off (AUDIT_LOG_ENABLED=False): skip all work
+    if not settings.AUDIT_LOG_ENABLED:
+        return None
 
-    # Create database record:
-    audit_log = AuditLog.objects.create(
+    return write_audit_event(
+        request,
         event_type=event_type,
         user=user,
         username=user.username,
-        ip_address=ip_address,
-        user_agent=user_agent,
         success=True,  # Admin actions are always successful if they execute
         message=message,
-        metadata=metadata,
+        metadata=metadata if metadata is not None else {},
     )
 
-    # Log to file (JSON format):
-    log_data = {
-        'event_type': event_type,
-        'user': user.username,
-        'ip_address': ip_address,
-        'message': message,
-        'metadata': metadata,
-    }
-    logger.info(json.dumps(log_data))
-
-    return audit_log
-
 
 # ----------------------------------------------------------------------------- #
 # Log a permission denied event to database and file.                           #
 #                                                                               #
 # Records unauthorized access attempts (403 Forbidden responses, permission     #
-# denials) with full context.                                                   #
+# denials) with full context. Repeats from the same IP for the same resource    #
+# within PERMISSION_DENIED_DEDUP_WINDOW are only logged to file, with their     #
+# suppressed_count.                                                             #
 #                                                                               #
-# Args:     request: Django HTTP request object                                 #
+# Args:     request: Django HTTP request object (or None)                       #
 #           user (User): Django User object attempting access (optional)        #
 #           resource (str): Resource/URL that was denied                        #
 #           message (str): Human-readable event description                     #
 #           metadata (dict): Additional event-specific data (optional)          #
-# Returns:  AuditLog: Created AuditLog instance                                 #
+# Returns:  AuditLog: Created (or queued) AuditLog (unsaved for repeats, None   #
+#           if disabled)                                                        #
 # ----------------------------------------------------------------------------- #
 def log_permission_denied(request, user=None, resource='', message='', metadata=None):
-    # Extract request context:
-    ip_address = get_client_ip(request)
-    user_agent = get_user_agent(request)
+    # Audit logging switched off (AUDIT_LOG_ENABLED=False): skip all work
+    if not settings.AUDIT_LOG_ENABLED:
+        return None
 
     # Get username (or 'anonymous' for unauthenticated users):
     username = user.username if user else 'anonymous'
@@ -218,30 +290,22 @@ def log_permission_denied(request, user=None, resource='', message='', metadata=
         metadata = {}
     metadata['resource'] = resource
 
-    # Get AuditLog model (lazy-loaded to avoid circular import):
-    AuditLog = get_audit_log_model()
+    # Repeats within the dedup window are only logged to file:
+    ip_address, _ = get_request_context(request)
+    repeat_count = count_repeat_denial(ip_address, resource)
+
+    file_fields = {'resource': resource}
+    if repeat_count:
+        file_fields['suppressed_count'] = repeat_count
 
-    # Create database record:
-    audit_log = AuditLog.objects.create(
+    return write_audit_event(
+        request,
+        save=not repeat_count,
+        file_fields=file_fields,
         event_type='permission_denied',
         user=user,
         username=username,
-        ip_address=ip_address,
-        user_agent=user_agent,
         success=False,  # Permission denials are failed actions
         message=message,
         metadata=metadata,
     )
-
-    # Log to file (JSON format):
-    log_data = {
-        'event_type': 'permission_denied',
-        'user': username,
-        'ip_address': ip_address,
-        'resource': resource,
-        'message': message,
-        'metadata': metadata,
-    }
-    logger.info(json.dumps(log_data))
-
-    return audit_log
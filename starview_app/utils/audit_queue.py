@@ -0,0 +1,150 @@
+# ----------------------------------------------------------------------------------------------------- #
+# This audit_queue.py file batches AuditLog database inserts off the request path:                      #
+#                                                                                                       #
+# Purpose:                                                                                              #
+# Every audit event used to cost one synchronous INSERT (and commit) inside the request. When           #
+# AUDIT_LOG_BATCHING is enabled, audit_logger.py hands unsaved AuditLog instances to this module, and   #
+# a background thread writes them with bulk_create() once BATCH_MAX entries are waiting or              #
+# FLUSH_INTERVAL seconds have passed, whichever comes first.                                            #
+#                                                                                                       #
+# Key Features:                                                                                         #
+# - Bounded lock-free queue (deque, QUEUE_MAX entries); when full (database slow or down), the oldest   #
+#   entries are dropped with a rate-limited warning instead of blocking requests                        #
+# - stats(): Queue depth and dropped-entry count for monitoring (reported by the /health/ endpoint)     #
+# - Worker thread is started lazily and restarted after a fork (gunicorn workers)                       #
+# - flush() waits for the worker's in-flight batch, then writes what is queued; registered with atexit  #
+#                                                                                                       #
+# Trade-off:                                                                                            #
+# Entries still in the queue are lost if the process is killed (SIGKILL, OOM) or dropped when it is     #
+# full. The file audit log (logs/audit.log) is written separately by the audit logger and keeps them.   #
+# ----------------------------------------------------------------------------------------------------- #
+
+# Import tools:
+import atexit
+import collections
+import logging
+import threading
+import time
+from django.apps import apps
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# Batching thresholds:
+QUEUE_MAX = 10000       # Entries held in memory; beyond this the oldest are dropped
+BATCH_MAX = 200         # Entries written per bulk_create()
+FLUSH_INTERVAL = 1.0    # Seconds a queued entry waits at most before being written
+DROP_WARNING_INTERVAL = 1.0  # Seconds between "queue full" warnings
+
+# deque.append()/popleft() are atomic, so producers never take a lock; _wake only wakes the worker early
+_pending = collections.deque(maxlen=QUEUE_MAX)
+_wake = threading.Event()
+_write_lock = threading.Lock()
+_worker = None
+_worker_lock = threading.Lock()
+
+# Monitoring counters (updated without a lock, so approximate under heavy contention):
+_dropped = 0
+_last_drop_warning = 0.0
+
+
+# ----------------------------------------------------------------------------- #
+# Queue an unsaved AuditLog instance for a batched insert.                      #
+#                                                                               #
+# Args:     entry (AuditLog): Unsaved audit log entry                           #
+# ----------------------------------------------------------------------------- #
+def enqueue(entry):
+    global _dropped, _last_drop_warning
+    _ensure_worker()
+
+    # Full: the append below drops the oldest entry (still in logs/audit.log) rather than block the request
+    if len(_pending) >= QUEUE_MAX:
+        _dropped += 1
+        now = time.monotonic()
+        if now - _last_drop_warning >= DROP_WARNING_INTERVAL:
+            _last_drop_warning = now
+            logger.warning(f"Audit log queue full; {_dropped} entries dropped so far")
+
+    _pending.append(entry)
+    if len(_pending) >= BATCH_MAX:
+        _wake.set()
+
+
+# ----------------------------------------------------------------------------- #
+# Write everything still queued, after the worker's in-flight batch.            #
+#                                                                               #
+# Registered with atexit; also safe to call at any time.                        #
+#                                                                               #
+# Args:     timeout (float): Seconds to wait for the worker's current batch     #
+# ----------------------------------------------------------------------------- #
+def flush(timeout=FLUSH_INTERVAL * 5):
+    acquired = _write_lock.acquire(timeout=timeout)
+    try:
+        # Safe even without the lock: popleft() hands each entry to exactly one writer
+        _drain()
+    finally:
+        if acquired:
+            _write_lock.release()
+
+
+# ----------------------------------------------------------------------------- #
+# Queue statistics for this process.                                            #
+#                                                                               #
+# Returns:  dict: depth (entries waiting) and dropped (entries lost to a full   #
+#           queue since the process started)                                    #
+# ----------------------------------------------------------------------------- #
+def stats():
+    return {'depth': len(_pending), 'dropped': _dropped}
+
+
+# Start the worker thread if this process doesn't have a live one yet:
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='audit-log-writer', daemon=True)
+            _worker.start()
+
+
+# Worker loop: wake every FLUSH_INTERVAL (or as soon as BATCH_MAX entries are waiting) and write:
+def _run():
+    while True:
+        _wake.wait(FLUSH_INTERVAL)
+        _wake.clear()
+        if not _pending:
+            continue
+
+        # The worker thread has its own DB connection; drop it if it has gone stale
+        close_old_connections()
+        with _write_lock:
+            _drain()
+
+
+# Write queued entries in BATCH_MAX chunks until the queue is empty:
+def _drain():
+    while True:
+        batch = []
+        while len(batch) < BATCH_MAX:
+            try:
+                batch.append(_pending.popleft())
+            except IndexError:
+                break
+
+        if not batch:
+            return
+        _write(batch)
+
+
+# Insert a batch with one bulk_create():
+def _write(batch):
+    AuditLog = apps.get_model('starview_app', 'AuditLog')
+    try:
+        AuditLog.objects.bulk_create(batch, batch_size=BATCH_MAX)
+    except Exception:
+        logger.exception(f"Failed to write {len(batch)} audit log entries")
+
+
+atexit.register(flush)
@@ -29,6 +29,7 @@
 # ----------------------------------------------------------------------------------------------------- #
 
 # Import tools:
+from hashlib import md5
 from django.core.cache import cache
 
 
@@ -44,11 +45,18 @@ def location_list_key(page=1):
     return f'location_list:page:{page}'
 
 
-# Generate cache key for location detail endpoint:
-def location_detail_key(location_id):
+# Generate cache key for location detail endpoint (?include=reviews is cached separately):
+def location_detail_key(location_id, include_reviews=False):
+    if include_reviews:
+        return f'location_detail:{location_id}:reviews'
     return f'location_detail:{location_id}'
 
 
+# Generate cache key for map info panel endpoint:
+def location_info_panel_key(location_id):
+    return f'location_info_panel:{location_id}'
+
+
 # Generate cache key for map markers endpoint:
 def map_markers_key():
     return 'map_markers:all'
@@ -64,6 +72,16 @@ def user_favorites_key(user_id):
     return f'favorites:user:{user_id}'
 
 
+# Generate cache key marking a location's enrichment task as queued (cleared when the task starts):
+def location_enrichment_pending_key(location_id):
+    return f'location_enrichment:pending:{location_id}'
+
+
+# Generate cache key for repeat permission denials (resource is hashed; it contains spaces and arbitrary paths):
+def permission_denied_key(ip_address, resource):
+    return f'audit:permission_denied:{ip_address}:{md5(resource.encode()).hexdigest()}'
+
+
 
 # ----------------------------------------------------------------------------------------------------- #
 #                                                                                                       #
@@ -86,9 +104,13 @@ def invalidate_location_list():
         cache.delete(location_list_key(page))
 
 
-# Clear cached location detail for a specific location:
+# Clear cached location detail (and map info panel) for a specific location:
 def invalidate_location_detail(location_id):
-    cache.delete(location_detail_key(location_id))
+    cache.delete_many([
+        location_detail_key(location_id),
+        location_detail_key(location_id, include_reviews=True),
+        location_info_panel_key(location_id),
+    ])
 
 
 # Clear cached map markers (affects all locations):
@@ -0,0 +1,53 @@
+# ----------------------------------------------------------------------------------------------------- #
+# This pagination.py file provides paginators for very large tables:                                    #
+#                                                                                                       #
+# Purpose:                                                                                              #
+# Django's Paginator runs an exact COUNT(*) to number the pages, which on PostgreSQL is a full scan of  #
+# the table. For append-only tables that grow without bound (votes), an unfiltered admin changelist     #
+# only needs a page count that is close enough.                                                         #
+#                                                                                                       #
+# Key Features:                                                                                         #
+# - CountEstimatePaginator: Uses the planner's row estimate (pg_class.reltuples) for unfiltered         #
+#   querysets on large PostgreSQL tables, and an exact count everywhere else                            #
+#                                                                                                       #
+# Usage:                                                                                                #
+# - Set `paginator = CountEstimatePaginator` on a ModelAdmin                                            #
+# ----------------------------------------------------------------------------------------------------- #
+
+# Import tools:
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap and the estimate isn't worth the error:
+ESTIMATE_THRESHOLD = 100000
+
+
+class CountEstimatePaginator(Paginator):
+
+    # ----------------------------------------------------------------------------- #
+    # Total number of objects, estimated for large unfiltered PostgreSQL tables.    #
+    #                                                                               #
+    # reltuples is refreshed by VACUUM/ANALYZE, so it lags recent writes slightly.  #
+    # Filtered querysets (search, list_filter) always get an exact count.           #
+    #                                                                               #
+    # Returns:  int: Estimated or exact object count                                #
+    # ----------------------------------------------------------------------------- #
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+
+            # reltuples is -1 (or tiny) before the first ANALYZE, so fall back to COUNT(*)
+            if row and row[0] >= ESTIMATE_THRESHOLD:
+                return int(row[0])
+
+        return super().count
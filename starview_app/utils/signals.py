@@ -6,20 +6,26 @@
 #                                                                                                       #
 # File Cleanup Signals (pre_delete, post_delete):                                                       #
 # 1. UserProfile deletion → Removes profile pictures                                                    #
-# 2. ReviewPhoto deletion → Removes review images and thumbnails                                        #
-# 3. Review deletion → Coordinates cleanup of all associated photos                                     #
-# 4. Location deletion → Coordinates cleanup of all reviews and photos via CASCADE                      #
+# 2. ReviewPhoto deletion → Removes review images and thumbnails (files only)                           #
+# 3. Review deletion → Prunes the review's empty photo directories once, after all photos are deleted   #
+# 4. Location deletion → Removes the location's photo directory tree with one shutil.rmtree()           #
+#                                                                                                       #
+# Vote Counter Signals (post_save, post_delete):                                                        #
+# - Vote created/flipped/deleted → Adjusts the voted Review's/ReviewComment's vote counters with F()    #
 #                                                                                                       #
 # Email Verification Signals (email_confirmed):                                                         #
 # - Email confirmed → Deletes EmailConfirmation token to prevent database bloat                         #
 #                                                                                                       #
 # Cleanup happens in phases:                                                                            #
-# - pre_delete: Delete files before database deletion (while paths are still accessible)                #
-# - post_delete: Clean up empty directories after CASCADE deletions complete                            #
+# - pre_delete: Queue file deletes for after the commit, one batch per delete() call (Celery task when  #
+#   CELERY_ENABLED; S3/R2 keys go out in bulk DeleteObjects requests)                                   #
+# - post_delete: Add the review/location photo directories to the same batch; they are cleaned up       #
+#   after its files are deleted                                                                         #
 #                                                                                                       #
 # Signal Registration:                                                                                  #
 # These signals are automatically registered when this module is imported via stars_app/apps.py         #
-# in the ready() method.                                                                                #
+# in the ready() method. Each receiver has a dispatch_uid, so importing it again never registers a      #
+# receiver twice. Fixture loading (raw saves) skips the profile and vote counter receivers.             #
 #                                                                                                       #
 # Safety Features:                                                                                      #
 # - Files are only deleted if they're within MEDIA_ROOT (security check)                                #
@@ -28,23 +34,42 @@
 # ----------------------------------------------------------------------------------------------------- #
 
 # Import tools:
+import logging
 import os
+import shutil
+import threading
+from django.db import transaction
+from django.db.models import F, QuerySet
 from django.db.models.signals import pre_delete, post_delete, post_save
 from django.dispatch import receiver
 from django.conf import settings
 from django.contrib.auth.models import User
-from pathlib import Path
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage, FileSystemStorage
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
 
 # Import models:
 from starview_app.models import UserProfile
 from starview_app.models import ReviewPhoto
 from starview_app.models import Review
+from starview_app.models import ReviewComment
 from starview_app.models import Location
+from starview_app.models import Vote
 
 # Import allauth signals and models:
 from allauth.account.signals import email_confirmed
 from allauth.account.models import EmailConfirmation
 
+# Media root as a resolved string, with a trailing separator so '/media2/...' doesn't pass as inside '/media':
+MEDIA_ROOT = os.path.realpath(settings.MEDIA_ROOT)
+MEDIA_ROOT_PREFIX = os.path.join(MEDIA_ROOT, '')
+
+# Most keys S3/R2 accept in one DeleteObjects request:
+S3_DELETE_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
 
 
 # ----------------------------------------------------------------------------------------------------- #
@@ -73,41 +98,36 @@ def safe_delete_file(file_path):
     try:
         # For local filesystem paths (absolute paths starting with /)
         if isinstance(file_path, str) and file_path.startswith('/'):
-            path = Path(file_path)
-
-            # Check if file exists and is within media directory (security check):
-            if path.exists() and str(path).startswith(str(settings.MEDIA_ROOT)):
-                # File gets deleted:
-                path.unlink()
-                return True
-            elif not path.exists():
-                # File already deleted or doesn't exist:
-                return True
-            else:
-                # File outside of media directory, so it doesn't get deleted:
-                return False
+
+            # Resolve '..' and symlinks first, so neither can point the delete outside MEDIA_ROOT:
+            resolved = os.path.realpath(file_path)
+
+            # File outside of media directory, so it doesn't get deleted (security check):
+            if not resolved.startswith(MEDIA_ROOT_PREFIX):
+                return not os.path.exists(resolved)
+
+            # File gets deleted (already deleted or missing counts as success):
+            try:
+                os.unlink(resolved)
+            except FileNotFoundError:
+                pass
+            return True
 
         # For Django FileField/ImageField objects (R2/S3 storage)
         # These have a 'storage' attribute and 'name' attribute
+        # (Storage.delete() ignores missing files, so no exists() round-trip first)
         elif hasattr(file_path, 'storage') and hasattr(file_path, 'name'):
-            if file_path.name and file_path.storage.exists(file_path.name):
+            if file_path.name:
                 file_path.storage.delete(file_path.name)
-                return True
             return True
 
         # For storage path strings (R2/S3 relative paths like 'profile_pics/xxx.jpg')
         else:
-            from django.core.files.storage import default_storage
-            file_str = str(file_path)
-            if default_storage.exists(file_str):
-                default_storage.delete(file_str)
-                return True
+            default_storage.delete(str(file_path))
             return True
 
     except Exception as e:
         # Log the error but don't crash (file deletion is not critical)
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning(f"Error deleting file {file_path}: {str(e)}")
         return False
 
@@ -115,35 +135,29 @@ def safe_delete_file(file_path):
 # ----------------------------------------------------------------------------- #
 # Safely delete an empty directory and its empty parent directories.            #
 #                                                                               #
+# Walks up one level at a time and stops at MEDIA_ROOT or at the first          #
+# directory that can't be removed (not empty, missing, not a directory).        #
+#                                                                               #
 # Args:   dir_path (str): Path to the directory to delete                       #
 # ----------------------------------------------------------------------------- #
 def safe_delete_directory(dir_path):
     if not dir_path:
         return
 
-    try:
-        path = Path(dir_path)
-
-        # Only delete if it's within media directory and is empty:
-        if (path.exists() and
-                str(path).startswith(str(settings.MEDIA_ROOT)) and
-                path.is_dir() and
-                not any(path.iterdir())):
-
-            # Delete empty directory:
-            path.rmdir()
-
-            # Try to delete parent directory if it's also empty:
-            parent = path.parent
-            if (parent != Path(settings.MEDIA_ROOT) and
-                    parent.exists() and
-                    parent.is_dir() and
-                    not any(parent.iterdir())):
-                safe_delete_directory(str(parent))
-
-    except Exception:
-        # There was an error deleting the directory:
-        return
+    # normpath() collapses '..' (and any trailing separator) before the prefix check:
+    dir_path = os.path.normpath(dir_path)
+
+    # Only delete within media directory (never MEDIA_ROOT itself):
+    while dir_path.startswith(MEDIA_ROOT_PREFIX):
+        try:
+            # rmdir() only succeeds on an empty directory, so it doubles as the emptiness check:
+            os.rmdir(dir_path)
+        except OSError:
+            # Directory isn't empty, doesn't exist, or couldn't be deleted:
+            return
+
+        # Try to delete parent directory if it's also empty:
+        dir_path = os.path.dirname(dir_path)
 
 
 
@@ -153,85 +167,241 @@ def safe_delete_directory(dir_path):
 #                                                                                                       #
 # ----------------------------------------------------------------------------------------------------- #
 
+# ----------------------------------------------------------------------------- #
+# Delete many stored files with as few storage requests as possible.            #
+#                                                                               #
+# On S3/R2 the keys go out in DeleteObjects requests of up to 1000 keys each    #
+# (one round-trip instead of one per file). Other storages delete one by one.   #
+#                                                                               #
+# Args:   names (list): Storage names of the files to delete                    #
+# ----------------------------------------------------------------------------- #
+def bulk_delete_files(names):
+    if not isinstance(default_storage, S3Storage):
+        for name in names:
+            safe_delete_file(name)
+        return
+
+    # Same key mapping S3Storage.delete() uses (applies AWS_LOCATION):
+    keys = [default_storage._normalize_name(clean_name(name)) for name in names]
+
+    for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+        chunk = keys[start:start + S3_DELETE_BATCH_SIZE]
+        try:
+            response = default_storage.bucket.delete_objects(
+                Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True}
+            )
+            for error in response.get('Errors', []):
+                logger.warning(f"Error deleting file {error.get('Key')}: {error.get('Message')}")
+
+        except Exception as e:
+            # Log the error but don't crash (file deletion is not critical)
+            logger.warning(f"Error deleting {len(chunk)} files: {str(e)}")
+
+
+# File names (and photo directories to clean up) queued by the delete() call currently running on this thread:
+class PendingFileDeletes:
+    def __init__(self, origin):
+        self.origin = origin
+        self.names = []
+        self.review_dirs = []
+        self.location_dirs = []
+
+
+    # on_commit callback: hand everything queued to delete_media_files at once
+    # (directories are cleaned up there, after the files inside them are deleted):
+    def dispatch(self):
+        if getattr(pending_deletes, 'batch', None) is self:
+            pending_deletes.batch = None
+
+        from starview_app.utils.tasks import delete_media_files
+        if getattr(settings, 'CELERY_ENABLED', False):
+            delete_media_files.delay(self.names, self.review_dirs, self.location_dirs)
+        else:
+            delete_media_files(self.names, self.review_dirs, self.location_dirs)
+
+
+pending_deletes = threading.local()
+
+
+# The batch for this signal origin, started (with its on_commit callback) if there isn't one yet:
+def get_pending_deletes(origin):
+    batch = getattr(pending_deletes, 'batch', None)
+    if batch is None or origin is None or batch.origin is not origin:
+        batch = PendingFileDeletes(origin)
+        pending_deletes.batch = batch
+        transaction.on_commit(batch.dispatch)
+    return batch
+
+
+# ----------------------------------------------------------------------------- #
+# Delete stored files once the surrounding transaction commits.                 #
+#                                                                               #
+# Every file from one delete() call (same signal origin, e.g. a Location and    #
+# all its cascaded ReviewPhotos) joins one batch with a single on_commit        #
+# callback. With Celery enabled the batch is deleted in the delete_media_files  #
+# task, otherwise inline after the commit. Files are never deleted for a        #
+# rolled-back delete (its callback is discarded, and the next delete() has a    #
+# different origin).                                                            #
+#                                                                               #
+# Args:   names (list): Storage names of the files to delete                    #
+#         origin: The signal's origin (instance or queryset being deleted)      #
+# ----------------------------------------------------------------------------- #
+def delete_files_on_commit(names, origin=None):
+    names = [name for name in names if name]
+    if not names:
+        return
+
+    get_pending_deletes(origin).names.extend(names)
+
+
 # Deletes user profile picture when user profile is deleted:
-@receiver(pre_delete, sender=UserProfile)
-def delete_user_profile_picture(instance, **kwargs):
+@receiver(pre_delete, sender=UserProfile, dispatch_uid='starview_app.delete_user_profile_picture')
+def delete_user_profile_picture(instance, origin=None, **kwargs):
     if instance.profile_picture:
-        file_path = instance.profile_picture.path
-        safe_delete_file(file_path)
+        delete_files_on_commit([instance.profile_picture.name], origin)
+
 
-        # Try to clean up empty directory:
-        dir_path = os.path.dirname(file_path)
-        safe_delete_directory(dir_path)
+# True if a delete signal is part of a cascade started by deleting a Location (or a Location queryset):
+def is_location_cascade(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is Location
 
 
 # Delete review photo and thumbnail files when ReviewPhoto is deleted:
-@receiver(pre_delete, sender=ReviewPhoto)
-def delete_review_photo_files(instance, **kwargs):
-    files_to_delete = []
+@receiver(pre_delete, sender=ReviewPhoto, dispatch_uid='starview_app.delete_review_photo_files')
+def delete_review_photo_files(instance, origin=None, **kwargs):
+    # On local storage the location's rmtree() removes these files along with the directory:
+    if is_location_cascade(origin) and isinstance(default_storage, FileSystemStorage):
+        return
 
-    # Add main image:
-    if instance.image:
-        files_to_delete.append(instance.image.path)
+    # Empty directories are pruned once per review in cleanup_review_directory_structure:
+    delete_files_on_commit([instance.image.name, instance.thumbnail.name], origin)
 
-    # Add thumbnail:
-    if instance.thumbnail:
-        files_to_delete.append(instance.thumbnail.path)
 
-    # Delete all files:
-    for file_path in files_to_delete:
-        safe_delete_file(file_path)
+# ----------------------------------------------------------------------------- #
+# Clean up the entire location directory structure after all cascade            #
+# deletions are complete.                                                       #
+#                                                                               #
+# One shutil.rmtree() removes review_photos/{location_id}/ with everything      #
+# left in it, so the per-review cleanup (and, on local storage, the per-photo   #
+# file deletes) are skipped during this cascade.                                #
+# ----------------------------------------------------------------------------- #
+@receiver(post_delete, sender=Location, dispatch_uid='starview_app.cleanup_location_directory_structure')
+def cleanup_location_directory_structure(instance, origin=None, **kwargs):
+    location_dir = os.path.join(MEDIA_ROOT, 'review_photos', str(instance.id))
 
-    # Clean up directories if they're empty:
-    if instance.image:
-        # Get the review-specific directory:
-        review_dir = os.path.dirname(instance.image.path)
-        safe_delete_directory(os.path.join(review_dir, 'thumbnails'))
-        safe_delete_directory(review_dir)
+    # Same batch as the cascaded photo deletes, so it's removed after them (also in the Celery task):
+    get_pending_deletes(origin).location_dirs.append(location_dir)
 
-        # Try to clean up location directory if empty:
-        location_dir = os.path.dirname(review_dir)
-        safe_delete_directory(location_dir)
 
+# Remove a location's photo directory tree (see cleanup_location_directory_structure):
+def delete_location_directory(location_dir):
+    # Only delete within media directory (security check; rmtree() never follows symlinks inside the tree):
+    if not os.path.realpath(location_dir).startswith(MEDIA_ROOT_PREFIX):
+        return
 
-# Clean up the entire location directory structure after all cascade deletions are complete:
-@receiver(post_delete, sender=Location)
-def cleanup_location_directory_structure(instance, **kwargs):
-    try:
-        # Try to clean up the main review photos directory:
-        review_photos_dir = os.path.join(settings.MEDIA_ROOT, 'review_photos', str(instance.id))
-        safe_delete_directory(review_photos_dir)
+    # Missing directory (nothing was uploaded) or a partial failure isn't worth failing the delete for:
+    shutil.rmtree(location_dir, ignore_errors=True)
 
-    except Exception:
-        # There was an error cleaning up directory structure for location:
-        return
+    # Try to clean up the main review photos directory if it's now empty:
+    safe_delete_directory(os.path.dirname(location_dir))
 
 
 # Clean up the review directory structure after all cascade deletions are complete:
-@receiver(post_delete, sender=Review)
-def cleanup_review_directory_structure(instance, **kwargs):
-    try:
-        # Try to clean up the main review directory:
-        review_dir = os.path.join(
-            settings.MEDIA_ROOT,
-            'review_photos',
-            str(instance.location.id),
-            str(instance.id)
-        )
-        safe_delete_directory(review_dir)
-
-    except Exception:
-        # There was an error cleaning up directory structure for review:
+@receiver(post_delete, sender=Review, dispatch_uid='starview_app.cleanup_review_directory_structure')
+def cleanup_review_directory_structure(instance, origin=None, **kwargs):
+    # The location's cleanup removes the whole tree once:
+    if is_location_cascade(origin):
+        return
+
+    review_dir = os.path.join(MEDIA_ROOT, 'review_photos', str(instance.location_id), str(instance.id))
+
+    # Same batch as the review's photo deletes, so it's pruned after them (also in the Celery task):
+    get_pending_deletes(origin).review_dirs.append(review_dir)
+
+
+# Take a deleted review off its location's rating stats (also for cascade and queryset deletes, e.g. a
+# user deleting their account or admin "delete selected", which never call Review.delete()):
+@receiver(post_delete, sender=Review, dispatch_uid='starview_app.update_location_rating_on_delete')
+def update_location_rating_on_delete(instance, origin=None, **kwargs):
+    # The location itself is being deleted, so there are no stats left to update
+    if is_location_cascade(origin):
         return
 
+    Review.apply_rating_delta(instance.location_id, -1, -instance.rating)
+
+
+# Remove a review's empty thumbnails and review directories (and the location directory above if empty):
+def delete_review_directory(review_dir):
+    safe_delete_directory(os.path.join(review_dir, 'thumbnails'))
+    safe_delete_directory(review_dir)
+
 
 # Automatically create UserProfile when User is created:
-@receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
-    if created:
+# (Users saved without one, e.g. via bulk_create(), are handled by `manage.py backfill_userprofiles`)
+@receiver(post_save, sender=User, dispatch_uid='starview_app.create_or_update_user_profile')
+def create_or_update_user_profile(sender, instance, created, raw=False, **kwargs):
+    # Fixtures (loaddata) carry their own UserProfile rows:
+    if created and not raw:
         UserProfile.objects.create(user=instance)
-    else:
-        UserProfile.objects.get_or_create(user=instance)  # Create profile for existing users if missing
+
+
+# ----------------------------------------------------------------------------- #
+# Apply a vote counter delta to the voted object with a single UPDATE.          #
+#                                                                               #
+# Votes on other content types are ignored (only Review and ReviewComment       #
+# store counters).                                                              #
+#                                                                               #
+# Args:   vote (Vote): The vote that changed                                    #
+#         up_delta (int): Change in upvote_count                                #
+#         down_delta (int): Change in downvote_count                            #
+# ----------------------------------------------------------------------------- #
+def apply_vote_counter_delta(vote, up_delta, down_delta):
+    model = ContentType.objects.get_for_id(vote.content_type_id).model_class()  # cached lookup
+    if model not in (Review, ReviewComment):
+        return
+
+    model.objects.filter(pk=vote.object_id).update(
+        upvote_count=F('upvote_count') + up_delta,
+        downvote_count=F('downvote_count') + down_delta,
+    )
+
+
+# Keep Review/ReviewComment vote counters in sync when a vote is cast or flipped:
+@receiver(post_save, sender=Vote, dispatch_uid='starview_app.update_vote_counters_on_save')
+def update_vote_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    # Fixtures (loaddata) already carry the counters on their Review/ReviewComment rows:
+    if raw:
+        return
+
+    previous = getattr(instance, '_loaded_is_upvote', None)
+
+    if created:
+        # New vote: count it once
+        apply_vote_counter_delta(instance, int(instance.is_upvote), int(not instance.is_upvote))
+    elif previous is not None and previous != instance.is_upvote:
+        # Flipped vote: move one count from the old type to the new type
+        delta = 1 if instance.is_upvote else -1
+        apply_vote_counter_delta(instance, delta, -delta)
+
+    instance._loaded_is_upvote = instance.is_upvote
+
+
+# True if a Vote delete is part of a cascade that also deletes what was voted on (Location → Review → ReviewComment):
+def is_voted_object_cascade(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in (Location, Review, ReviewComment)
+
+
+# Keep Review/ReviewComment vote counters in sync when a vote is removed:
+@receiver(post_delete, sender=Vote, dispatch_uid='starview_app.update_vote_counters_on_delete')
+def update_vote_counters_on_delete(sender, instance, origin=None, **kwargs):
+    # The voted object is deleted in the same cascade, so skip one pointless UPDATE per vote
+    if is_voted_object_cascade(origin):
+        return
+
+    is_upvote = getattr(instance, '_loaded_is_upvote', instance.is_upvote)
+    apply_vote_counter_delta(instance, -int(is_upvote), -int(not is_upvote))
 
 
 # ----------------------------------------------------------------------------- #
@@ -247,13 +417,15 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
 #   - request: HTTP request object                                              #
 #   - email_address: EmailAddress instance that was confirmed                   #
 # ----------------------------------------------------------------------------- #
-@receiver(email_confirmed)
+@receiver(email_confirmed, dispatch_uid='starview_app.delete_email_confirmation_on_confirm')
 def delete_email_confirmation_on_confirm(sender, request, email_address, **kwargs):
     
     # Delete all confirmation tokens for this email address
     # Normally there's only one, but just in case there are multiple (edge case)
+    # (No signals or cascades on EmailConfirmation, so Django runs this as a single DELETE)
     deleted_count, _ = EmailConfirmation.objects.filter(email_address=email_address).delete()
 
     # Log the cleanup (useful for debugging)
     if deleted_count > 0:
-        print(f"[Signal] Deleted {deleted_count} EmailConfirmation(s) for {email_address.email}")
+        # Lazy %-formatting: the message is only built if INFO records are actually emitted
+        logger.info("Deleted %d EmailConfirmation(s) for %s", deleted_count, email_address.email)
@@ -7,6 +7,8 @@
 #                                                                                                       #
 # Key Tasks:                                                                                            #
 # - enrich_location_data: Fetches address and elevation from Mapbox (2-5 seconds)                       #
+# - process_ses_notification: Records SES bounces/complaints received by the SNS webhooks               #
+# - delete_media_files: Deletes stored files of deleted profiles/review photos (after commit)           #
 # - Future tasks: Bulk email sending, image processing, data exports, report generation                 #
 #                                                                                                       #
 # Architecture:                                                                                         #
@@ -20,6 +22,8 @@
 # Asynchronous: enrich_location_data.delay(location_id)     # Returns immediately                       #
 # ----------------------------------------------------------------------------------------------------- #
 
+import random
+import requests
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
@@ -27,6 +31,19 @@ from django.conf import settings
 # Get Celery logger (integrates with Celery's logging system)
 logger = get_task_logger(__name__)
 
+# Retry backoff: 30s, 60s, 120s... capped at 10 minutes, with full jitter so failed tasks don't retry in lockstep
+RETRY_BACKOFF = 30
+RETRY_BACKOFF_MAX = 600
+
+
+# How long a queued enrichment blocks queueing another for the same location (in case the task is lost):
+ENRICHMENT_PENDING_TIMEOUT = 300
+
+
+# Seconds to wait before the next retry (random between 0 and the exponential backoff):
+def retry_countdown(retries):
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** retries))
+
 
 # ----------------------------------------------------------------------------- #
 # Enriches a location with address and elevation data from Mapbox.              #
@@ -45,14 +62,15 @@ logger = get_task_logger(__name__)
 # Task Settings:                                                                #
 #   - bind=True: Task instance passed as first arg (enables self.retry())       #
 #   - max_retries=3: Retry up to 3 times on failure                             #
-#   - default_retry_delay=60: Wait 60 seconds between retries                   #
+#   - Retries back off exponentially with jitter (see retry_countdown())        #
 #                                                                               #
 # Error Handling:                                                               #
-#   - If Mapbox API fails, task retries up to 3 times                           #
+#   - If Mapbox times out, is unreachable, or returns 429/5xx, the task saves   #
+#     whatever succeeded and retries up to 3 times                              #
 #   - If location not found (deleted), task fails gracefully                    #
 #   - Logs all operations for monitoring and debugging                          #
 # ----------------------------------------------------------------------------- #
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+@shared_task(bind=True, max_retries=3)
 def enrich_location_data(self, location_id):
     """
     Asynchronously enriches a location with address and elevation data from Mapbox.
@@ -60,14 +78,22 @@ def enrich_location_data(self, location_id):
     This task is triggered after a location is created, allowing the user to get
     an instant response while the enrichment happens in the background.
     """
+    from django.core.cache import cache
     from starview_app.models import Location
     from starview_app.services.location_service import LocationService
+    from starview_app.utils.cache import location_enrichment_pending_key
 
     logger.info(f"Starting enrichment for location ID: {location_id}")
 
+    # Clear the queued marker before reading the row: edits from here on queue a new task
+    cache.delete(location_enrichment_pending_key(location_id))
+
     try:
-        # Get the location object
-        location = Location.objects.get(id=location_id)
+        # Get the location object (only the fields enrichment and Location.save() read)
+        location = Location.objects.only(
+            'id', 'name', 'latitude', 'longitude', 'elevation',
+            'formatted_address', 'administrative_area', 'locality', 'country',
+        ).get(id=location_id)
 
         # Skip if external APIs are disabled (testing mode)
         if getattr(settings, 'DISABLE_EXTERNAL_APIS', False):
@@ -78,31 +104,19 @@ def enrich_location_data(self, location_id):
                 'reason': 'DISABLE_EXTERNAL_APIS is True'
             }
 
-        # Track which fields were successfully enriched
-        enriched_fields = []
+        # Fetch address and elevation concurrently, saved together in one UPDATE
+        # (a failed part doesn't fail the other; a transient Mapbox failure is raised for a retry)
+        enriched_fields = LocationService.enrich_location(location, raise_transient=True)
 
-        # Enrich address from coordinates
-        try:
-            address_success = LocationService.update_address_from_coordinates(location)
-            if address_success:
-                enriched_fields.append('address')
-                logger.info(f"Address enriched for location {location_id}: {location.formatted_address}")
-            else:
-                logger.warning(f"Address enrichment failed for location {location_id}")
-        except Exception as e:
-            logger.error(f"Error enriching address for location {location_id}: {str(e)}")
-            # Don't fail the entire task if address fails, continue to elevation
-
-        # Enrich elevation from Mapbox
-        try:
-            elevation_success = LocationService.update_elevation_from_mapbox(location)
-            if elevation_success:
-                enriched_fields.append('elevation')
-                logger.info(f"Elevation enriched for location {location_id}: {location.elevation}m")
-            else:
-                logger.warning(f"Elevation enrichment failed for location {location_id}")
-        except Exception as e:
-            logger.error(f"Error enriching elevation for location {location_id}: {str(e)}")
+        if 'address' in enriched_fields:
+            logger.info(f"Address enriched for location {location_id}: {location.formatted_address}")
+        else:
+            logger.warning(f"Address enrichment failed for location {location_id}")
+
+        if 'elevation' in enriched_fields:
+            logger.info(f"Elevation enriched for location {location_id}: {location.elevation}m")
+        else:
+            logger.warning(f"Elevation enrichment failed for location {location_id}")
 
         # Return success with enriched fields
         result = {
@@ -126,13 +140,13 @@ def enrich_location_data(self, location_id):
             'error': 'Location not found (may have been deleted)'
         }
 
-    except Exception as exc:
-        # Unexpected error - retry the task
-        logger.error(f"Unexpected error enriching location {location_id}: {str(exc)}")
+    except requests.exceptions.RequestException as exc:
+        # Transient Mapbox failure (timeout, connection error, rate limit, 5xx) - retry the task
+        logger.warning(f"Mapbox unavailable enriching location {location_id}: {str(exc)}")
 
         # Retry the task (up to max_retries times)
         try:
-            raise self.retry(exc=exc)
+            raise self.retry(exc=exc, countdown=retry_countdown(self.request.retries))
         except self.MaxRetriesExceededError:
             logger.error(f"Max retries exceeded for location {location_id}")
             return {
@@ -142,6 +156,31 @@ def enrich_location_data(self, location_id):
             }
 
 
+# ----------------------------------------------------------------------------- #
+# Records an SES bounce or complaint notification received by the SNS webhooks. #
+#                                                                               #
+# The webhook verifies the SNS signature and queues this task, so SNS gets its  #
+# 200 response without waiting on the bounce/complaint/suppression writes.      #
+#                                                                               #
+# Args:                                                                         #
+#   message_id (str): SNS message ID (used for deduplication)                   #
+#   message (dict): Parsed SES notification                                     #
+#                                                                               #
+# Returns:                                                                      #
+#   dict: Number of bounce/complaint/skipped notifications processed            #
+# ----------------------------------------------------------------------------- #
+@shared_task(bind=True, max_retries=3)
+def process_ses_notification(self, message_id, message):
+    from starview_app.services import EmailEventService
+
+    try:
+        return EmailEventService.process_batch([(message_id, message)])
+
+    except Exception as exc:
+        logger.error(f"Error processing SES notification {message_id}: {str(exc)}")
+        raise self.retry(exc=exc, countdown=retry_countdown(self.request.retries))
+
+
 # ----------------------------------------------------------------------------- #
 # Example task for testing Celery setup.                                        #
 #                                                                               #
@@ -154,3 +193,32 @@ def enrich_location_data(self, location_id):
 def test_celery(message):
     logger.info(f"Test task received message: {message}")
     return f"Task completed successfully: {message}"
+
+
+# ----------------------------------------------------------------------------- #
+# Deletes stored media files (profile pictures, review photos, thumbnails).     #
+#                                                                               #
+# Queued by the pre_delete signals once the delete has committed, so the        #
+# request doesn't wait on storage round-trips. Missing files are ignored and    #
+# errors are logged by bulk_delete_files(), so the task never retries.          #
+#                                                                               #
+# The photo directories of deleted reviews/locations are cleaned up here too,   #
+# after the files in them are gone (pruning earlier would find them non-empty). #
+#                                                                               #
+# Args:                                                                         #
+#   names (list): Storage names of the files to delete                          #
+#   review_dirs (list): Review photo directories to prune once empty            #
+#   location_dirs (list): Location photo directory trees to remove              #
+# ----------------------------------------------------------------------------- #
+@shared_task
+def delete_media_files(names, review_dirs=(), location_dirs=()):
+    from starview_app.utils.signals import (
+        bulk_delete_files, delete_review_directory, delete_location_directory
+    )
+
+    if names:
+        bulk_delete_files(names)
+    for review_dir in review_dirs:
+        delete_review_directory(review_dir)
+    for location_dir in location_dirs:
+        delete_location_directory(location_dir)
@@ -16,7 +16,6 @@
 # Import tools:
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Avg, Count
 
 # Import models:
 from ..models import FavoriteLocation
@@ -56,16 +55,22 @@ class FavoriteLocationViewSet(viewsets.ModelViewSet):
             'location__reviews__comments__votes'  # Prefetch votes for comments
         )
 
-        # Add annotations to the nested location objects
-        # This is done through a subquery to annotate the location
-        queryset = queryset.annotate(
-            location_review_count=Count('location__reviews'),
-            location_average_rating=Avg('location__reviews__rating')
-        )
-
+        # Review count and average rating come from the stored Location stats,
+        # so the favorites query doesn't need to join and group the reviews
         return queryset.order_by('-created_at')
 
 
+    # Load the user's favorite location IDs once for the nested LocationSerializer (reads only,
+    # since a create would need the new favorite in the set):
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('list', 'retrieve') and self.request.user.is_authenticated:
+            context['favorite_location_ids'] = set(
+                FavoriteLocation.objects.filter(user=self.request.user).values_list('location_id', flat=True)
+            )
+        return context
+
+
     # Automatically set user field when creating favorites:
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -25,6 +25,7 @@
 # 1. Database (PostgreSQL): Verifies connection pool and query execution                                #
 # 2. Cache (Redis): Tests connection and read/write operations                                          #
 # 3. Celery Worker: Verifies broker connection and worker availability (when enabled)                   #
+# 4. Audit Log Queue: Reports this process's batched-insert queue depth and drops (informational)       #
 #                                                                                                       #
 # Use Cases:                                                                                            #
 # - Render load balancer pings /health/ every 30 seconds                                                #
@@ -113,6 +114,15 @@ def health_check(request):
             is_healthy = False
             logger.error(f"Health check - Celery failure: {e}", exc_info=True)
 
+    # 4. Audit Log Queue (INFORMATIONAL - never marks the instance unhealthy)
+    if getattr(settings, 'AUDIT_LOG_BATCHING', False):
+        from starview_app.utils import audit_queue
+        queue_stats = audit_queue.stats()
+        checks["audit_queue"] = "dropping" if queue_stats["dropped"] else "ok"
+    else:
+        queue_stats = None
+        checks["audit_queue"] = "disabled"
+
     # Build response
     response_data = {
         "status": "healthy" if is_healthy else "unhealthy",
@@ -120,6 +130,9 @@ def health_check(request):
         "checks": checks
     }
 
+    if queue_stats is not None:
+        response_data["audit_queue"] = queue_stats
+
     if errors:
         response_data["errors"] = errors
 
@@ -22,7 +22,7 @@
 # Django imports:
 from django.shortcuts import get_object_or_404
 from django.conf import settings
-from django.db.models import Avg, Count, Q, Exists, OuterRef
+from django.db.models import Avg, Count, F, Q, Exists, OuterRef, Value, BooleanField
 
 # REST Framework imports:
 from rest_framework import viewsets, status, serializers
@@ -37,6 +37,7 @@ from ..models import FavoriteLocation
 
 # Serializer imports:
 from ..serializers import LocationSerializer
+from ..serializers import LocationListSerializer
 from ..serializers import MapLocationSerializer
 from ..serializers import LocationInfoPanelSerializer
 
@@ -51,6 +52,7 @@ from starview_app.utils import ContentCreationThrottle, ReportThrottle
 from starview_app.utils import (
     location_list_key,
     location_detail_key,
+    location_info_panel_key,
     map_markers_key,
     invalidate_location_list,
     invalidate_location_detail,
@@ -81,36 +83,55 @@ class LocationViewSet(viewsets.ModelViewSet):
 
     # Use different serializers for list vs detail views:
     def get_serializer_class(self):
-        # For list view, don't include nested reviews (too much data)
-        # Reviews are available via the nested endpoint /api/locations/{id}/reviews/
-        if self.action == 'list':
-            from ..serializers import LocationListSerializer
+        # Actions that declare their own serializer_class (map_markers, info_panel)
+        if self.serializer_class is not None:
+            return self.serializer_class
+
+        # Don't include nested reviews (too much data for popular locations)
+        # Reviews are available via the paginated nested endpoint /api/locations/{id}/reviews/
+        if self.action == 'list' or (self.action == 'retrieve' and not self.include_reviews()):
             return LocationListSerializer
 
-        # SCALABILITY NOTE:
-        # Currently 'retrieve' (detail) view returns LocationSerializer with ALL nested reviews.
-        # This works fine for locations with 1-20 reviews, but can be slow with 100+ reviews.
-        #
-        # For better scalability, change this to:
-        #   return LocationListSerializer
-        #
-        # Then have frontend fetch reviews separately via:
-        #   GET /api/locations/{id}/reviews/?page=1 (already paginated, 20 per page)
+        # Detail view with ?include=reviews (kept for backward compatibility) returns
+        # LocationSerializer with ALL nested reviews
         return LocationSerializer
 
 
+    # Whether the client asked for nested reviews on the detail view (?include=reviews):
+    def include_reviews(self):
+        return 'reviews' in self.request.query_params.get('include', '').split(',')
+
+
     # Optimize queryset with select_related, prefetch_related, and annotations:
     def get_queryset(self):
         queryset = Location.objects.select_related(
             'added_by',
             'verified_by'
-        ).annotate(
+        )
+
+        # Info panel reads the stored rating stats and has no user-specific data,
+        # so skip the review aggregation and favorite lookup
+        if self.action == 'info_panel':
+            return queryset
+
+        queryset = queryset.annotate(
             review_count_annotated=Count('reviews'),
             average_rating_annotated=Avg('reviews__rating')
         )
 
-        # For detail view, prefetch nested reviews with votes to avoid N+1
-        if self.action == 'retrieve':
+        # LocationListSerializer only needs these columns (skips verification_notes, stats, etc.)
+        if self.get_serializer_class() is LocationListSerializer:
+            queryset = queryset.only(
+                'id', 'name', 'latitude', 'longitude', 'elevation',
+                'formatted_address', 'administrative_area', 'locality', 'country',
+                'created_at', 'is_verified', 'verification_date',
+                'times_reported', 'last_visited', 'visitor_count',
+                'added_by__id', 'added_by__username',
+                'verified_by__id', 'verified_by__username',
+            )
+
+        # For detail view with nested reviews, prefetch them with votes to avoid N+1
+        if self.action == 'retrieve' and self.include_reviews():
             queryset = queryset.prefetch_related(
                 'reviews__user',
                 'reviews__photos',
@@ -119,20 +140,25 @@ class LocationViewSet(viewsets.ModelViewSet):
                 'reviews__comments__votes'  # Prefetch votes for comments
             )
         else:
-            # For list view, we don't include nested reviews in serializer
+            # Other views don't include nested reviews in serializer
             # so no need to prefetch them
             pass
 
-        # Add is_favorited annotation for authenticated users
+        # Always annotate is_favorited (constant False for anonymous users) so the
+        # serializer never falls back to a per-row query and it can be filtered in SQL
         if self.request.user.is_authenticated:
             queryset = queryset.annotate(
                 is_favorited_annotated=Exists(
                     FavoriteLocation.objects.filter(
-                        user=self.request.user,
+                        user_id=self.request.user.id,
                         location=OuterRef('pk')
                     )
                 )
             )
+        else:
+            queryset = queryset.annotate(
+                is_favorited_annotated=Value(False, output_field=BooleanField())
+            )
 
         return queryset
 
@@ -187,22 +213,25 @@ class LocationViewSet(viewsets.ModelViewSet):
     #                                                                               #
     # Cache Strategy:                                                               #
     # - Cache each location separately for 15 minutes (900 seconds)                 #
-    # - Authenticated users get different cache (includes is_favorited, nested      #
-    # reviews with user_vote)                                                       #
+    # - Authenticated users get different cache (includes is_favorited, and       #
+    # user_vote on nested reviews)                                                  #
+    # - ?include=reviews responses are cached under their own key                   #
     # - Invalidated when: location updated, review added/updated/deleted            #
     #                                                                               #
     # Performance Impact:                                                           #
-    # - Before caching: 9 queries per request (with prefetching)                    #
+    # - Without nested reviews: 2 queries per request, independent of review count  #
+    # - With ?include=reviews: 9 queries per request (with prefetching)             #
     # - After caching: 0 queries for cache hits (~80%+ of requests)                 #
     # ----------------------------------------------------------------------------- #
     def retrieve(self, request, *args, **kwargs):
         location_id = kwargs.get('pk')
+        detail_key = location_detail_key(location_id, include_reviews=self.include_reviews())
 
         # Different cache keys for authenticated vs anonymous users
         if request.user.is_authenticated:
-            cache_key = f'{location_detail_key(location_id)}:user:{request.user.id}'
+            cache_key = f'{detail_key}:user:{request.user.id}'
         else:
-            cache_key = location_detail_key(location_id)
+            cache_key = detail_key
 
         # Try to get from cache
         cached_data = cache.get(cache_key)
@@ -294,9 +323,9 @@ class LocationViewSet(viewsets.ModelViewSet):
             description=request.data.get('description', '')
         )
 
-        # Increment report counter on the location
-        location.times_reported += 1
-        location.save()
+        # Increment report counter on the location (single UPDATE; a full save would also rewrite
+        # the rating stats and could undo concurrent review updates)
+        Location.objects.filter(pk=location.pk).update(times_reported=F('times_reported') + 1)
 
         # Return success response
         content_type_name = report.content_type.model.replace('_', ' ').capitalize()
@@ -314,31 +343,43 @@ class LocationViewSet(viewsets.ModelViewSet):
     #                                                                               #
     # Cache Strategy:                                                               #
     # - Cached for 30 minutes (1800 seconds) - map data changes infrequently        #
-    # - Same for all users (no user-specific data)                                  #
+    # - Same for all users (cached with is_favorited=False)                         #
     # - Invalidated when: location created, location deleted, coordinates change    #
+    #                                                                               #
+    # is_favorited is filled in per request from one query of the user's favorite   #
+    # location IDs, instead of one exists() query per marker.                       #
     # ----------------------------------------------------------------------------- #
     @action(detail=False, methods=['GET'], serializer_class=MapLocationSerializer)
     def map_markers(self, request):
 
         # Try to get from cache (same for all users)
         cache_key = map_markers_key()
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return Response(cached_data)
-
-        # Cache miss - get data from database
-        # Get all locations
-        queryset = Location.objects.all()
-
-        # Optimize database query - only fetch needed columns
-        queryset = queryset.only('id', 'name', 'latitude', 'longitude')
+        response_data = cache.get(cache_key)
+
+        if response_data is None:
+            # Cache miss - get data from database
+            # Optimize database query - only fetch needed columns, and stream rows in
+            # chunks so the queryset doesn't also hold every Location in its result cache
+            queryset = Location.objects.only('id', 'name', 'latitude', 'longitude')
+
+            # Serialize without user-specific state so the result can be shared
+            context = self.get_serializer_context()
+            context['favorite_location_ids'] = frozenset()
+            serializer = MapLocationSerializer(queryset.iterator(chunk_size=2000), many=True, context=context)
+            response_data = serializer.data
 
-        # Serialize and return as simple array
-        serializer = self.get_serializer(queryset, many=True)
-        response_data = serializer.data
+            # Cache for 30 minutes (longer than list/detail since map data rarely changes)
+            cache.set(cache_key, response_data, timeout=1800)
 
-        # Cache for 30 minutes (longer than list/detail since map data rarely changes)
-        cache.set(cache_key, response_data, timeout=1800)
+        # Mark the current user's favorites (one query + set lookups)
+        if request.user.is_authenticated:
+            favorite_location_ids = set(
+                FavoriteLocation.objects.filter(user=request.user).values_list('location_id', flat=True)
+            )
+            response_data = [
+                {**marker, 'is_favorited': marker['id'] in favorite_location_ids}
+                for marker in response_data
+            ]
 
         return Response(response_data)
 
@@ -349,13 +390,29 @@ class LocationViewSet(viewsets.ModelViewSet):
     # Returns just enough data to populate the info panel that appears when         #
     # a user clicks a marker on the map. Excludes heavy nested data like full       #
     # review content, photos, comments, and vote data.                              #
+    #                                                                               #
+    # Cache Strategy:                                                               #
+    # - Cached per location for 15 minutes (900 seconds), same for all users        #
+    # - Review count/average come from the stored Location stats (no COUNT/AVG)     #
+    # - Invalidated with the location detail: review added/updated/deleted,         #
+    # location updated/deleted                                                      #
     # ----------------------------------------------------------------------------- #
     @action(detail=True, methods=['GET'], serializer_class=LocationInfoPanelSerializer)
     def info_panel(self, request, pk=None):
-        
+
+        # Try to get from cache (same for all users)
+        cache_key = location_info_panel_key(pk)
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            return Response(cached_data)
+
         location = self.get_object()
         serializer = self.get_serializer(location)
-        return Response(serializer.data)
+        response_data = serializer.data
+
+        cache.set(cache_key, response_data, timeout=900)
+
+        return Response(response_data)
 
 
 
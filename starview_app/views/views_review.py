@@ -21,6 +21,7 @@
 
 # Django imports:
 from django.shortcuts import get_object_or_404
+from django.db.models import BooleanField, Case, F, Value, When
 
 # REST Framework imports:
 from rest_framework import viewsets, status, exceptions
@@ -29,7 +30,7 @@ from rest_framework.permissions import IsAuthenticated, BasePermission, SAFE_MET
 from rest_framework.response import Response
 
 # Model imports:
-from starview_app.models.model_review import Review
+from starview_app.models.model_review import Review, EDIT_THRESHOLD
 from starview_app.models.model_review_comment import ReviewComment
 from starview_app.models.model_review_photo import ReviewPhoto
 from starview_app.models.model_location import Location
@@ -116,10 +117,19 @@ class ReviewViewSet(viewsets.ModelViewSet):
             'location'
         ).prefetch_related(
             'photos',
-            'comments__user',
-            'votes'  # Prefetch votes to avoid N+1 in get_user_vote()
+            'comments__user'
+        ).annotate(
+            # Compute is_edited in SQL instead of per serialized review
+            is_edited_annotated=Case(
+                When(updated_at__gt=F('created_at') + EDIT_THRESHOLD, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
         )
 
+        # Current user's vote per review in SQL (avoids N+1 in get_user_vote())
+        queryset = VoteService.annotate_user_vote(queryset, self.request.user)
+
         return queryset
 
 
@@ -334,16 +344,17 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     # Filter comments by review from URL parameters:
     def get_queryset(self):
-        return ReviewComment.objects.filter(
+        queryset = ReviewComment.objects.filter(
             review_id=self.kwargs['review_pk']
         ).select_related(
             'user',
             'user__userprofile',
             'review'
-        ).prefetch_related(
-            'votes'  # Prefetch votes to avoid N+1 in get_user_vote()
         )
 
+        # Current user's vote per comment in SQL (avoids N+1 in get_user_vote())
+        return VoteService.annotate_user_vote(queryset, self.request.user)
+
 
     # Create a comment for a specific review:
     def perform_create(self, serializer):
@@ -29,6 +29,7 @@
 #                                                                                                       #
 # Integration:                                                                                          #
 # AWS SES → AWS SNS → These webhook endpoints → EmailBounce/EmailComplaint models                       #
+# With CELERY_ENABLED=True the database writes run in the process_ses_notification task instead.        #
 # ----------------------------------------------------------------------------------------------------- #
 
 import json
@@ -36,11 +37,32 @@ import logging
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from django.contrib.auth import get_user_model
-from starview_app.models import EmailBounce, EmailComplaint, EmailSuppressionList
+from django.conf import settings
+from starview_app.services import EmailEventService
 
 logger = logging.getLogger(__name__)
-User = get_user_model()
+
+
+
+# ----------------------------------------------------------------------------- #
+# Hand a verified SES notification off for processing.                          #
+#                                                                               #
+# When Celery is enabled the database writes happen in a background task, so    #
+# the webhook can answer SNS as soon as the message is queued. Otherwise the    #
+# notification is processed inline (development, free tier deployment).         #
+#                                                                               #
+# Args:     message_id (str): SNS message ID                                    #
+#           message (dict): Parsed SES notification                             #
+# Returns:  dict: JSON response body for SNS                                    #
+# ----------------------------------------------------------------------------- #
+def dispatch_notification(message_id, message):
+    if getattr(settings, 'CELERY_ENABLED', False):
+        from starview_app.utils.tasks import process_ses_notification
+        process_ses_notification.delay(message_id, message)
+        return {'status': 'queued'}
+
+    results = EmailEventService.process_batch([(message_id, message)])
+    return {'status': 'success', 'processed': results['bounces'] + results['complaints']}
 
 
 
@@ -183,86 +205,10 @@ def ses_bounce_webhook(request):
             logger.warning(f"Unexpected notification type: {notification_type}")
             return JsonResponse({'error': 'Not a bounce notification'}, status=400)
 
-        # Extract bounce details
-        bounce = message.get('bounce', {})
-        bounce_type = bounce.get('bounceType', 'Undetermined').lower()
-        bounce_subtype = bounce.get('bounceSubType', 'undetermined').lower().replace(' ', '_')
-
-        # Map AWS bounce types to our choices
-        # AWS uses: Permanent (hard), Temporary (soft/transient), Transient (connection issues)
-        bounce_type_map = {
-            'permanent': 'hard',        # Permanent failure (invalid email, domain doesn't exist)
-            'temporary': 'soft',        # Temporary failure (mailbox full, server down)
-            'transient': 'transient',   # Connection issues (throttling, timeout)
-            'undetermined': 'transient',
-        }
-        bounce_type = bounce_type_map.get(bounce_type, 'transient')
-
-        # Process each bounced recipient
-        bounced_recipients = bounce.get('bouncedRecipients', [])
-        for recipient in bounced_recipients:
-            email = recipient.get('emailAddress', '').lower()
-            if not email:
-                continue
-
-            # Check for existing bounce record
-            existing_bounce = EmailBounce.objects.filter(email=email).first()
-
-            if existing_bounce:
-                # Update existing record
-                existing_bounce.bounce_count += 1
-                existing_bounce.bounce_type = bounce_type
-                existing_bounce.bounce_subtype = bounce_subtype
-                existing_bounce.diagnostic_code = recipient.get('diagnosticCode', '')
-                existing_bounce.sns_message_id = sns_message.get('MessageId', '')
-                existing_bounce.raw_notification = message
-                existing_bounce.save()
-
-                logger.info(f"Updated bounce record for {email}: {existing_bounce.bounce_count}x")
-                bounce_record = existing_bounce
-            else:
-                # Find user if exists
-                user = None
-                try:
-                    user = User.objects.get(email=email)
-                except User.DoesNotExist:
-                    pass
-
-                # Create new bounce record
-                bounce_record = EmailBounce.objects.create(
-                    email=email,
-                    user=user,
-                    bounce_type=bounce_type,
-                    bounce_subtype=bounce_subtype,
-                    bounce_count=1,
-                    sns_message_id=sns_message.get('MessageId', ''),
-                    diagnostic_code=recipient.get('diagnosticCode', ''),
-                    raw_notification=message,
-                )
-
-                logger.info(f"Created bounce record for {email}: {bounce_type}")
-
-            # Check if should suppress
-            if bounce_record.should_suppress() and not bounce_record.suppressed:
-                # Add to suppression list
-                reason = 'hard_bounce' if bounce_type == 'hard' else 'soft_bounce'
-                EmailSuppressionList.add_to_suppression(
-                    email=email,
-                    reason=reason,
-                    bounce=bounce_record,
-                    notes=f"Auto-suppressed after {bounce_record.bounce_count} {bounce_type} bounce(s)"
-                )
-
-                # Mark bounce as suppressed
-                bounce_record.suppressed = True
-                bounce_record.save()
-
-                logger.warning(f"Email suppressed due to bounces: {email} ({reason})")
-
-        return JsonResponse({
-            'status': 'success',
-            'processed': len(bounced_recipients)
-        }, status=200)
+        # Update bounce records and suppression list (queued when Celery is enabled)
+        response_data = dispatch_notification(sns_message.get('MessageId', ''), message)
+
+        return JsonResponse(response_data, status=200)
 
     except Exception as e:
         logger.error(f"Error processing bounce webhook: {str(e)}", exc_info=True)
@@ -328,68 +274,10 @@ def ses_complaint_webhook(request):
             logger.warning(f"Unexpected notification type: {notification_type}")
             return JsonResponse({'error': 'Not a complaint notification'}, status=400)
 
-        # Extract complaint details
-        complaint = message.get('complaint', {})
-        complaint_feedback_type = complaint.get('complaintFeedbackType', 'other')
-        user_agent = complaint.get('userAgent', '')
-
-        # Map AWS complaint types to our choices
-        complaint_type_map = {
-            'abuse': 'abuse',
-            'auth-failure': 'auth-failure',
-            'fraud': 'fraud',
-            'not-spam': 'not-spam',
-            'other': 'other',
-            'virus': 'virus',
-        }
-        complaint_type = complaint_type_map.get(complaint_feedback_type, 'other')
-
-        # Process each complained recipient
-        complained_recipients = complaint.get('complainedRecipients', [])
-        for recipient in complained_recipients:
-            email = recipient.get('emailAddress', '').lower()
-            if not email:
-                continue
-
-            # Find user if exists
-            user = None
-            try:
-                user = User.objects.get(email=email)
-            except User.DoesNotExist:
-                pass
-
-            # Create complaint record
-            complaint_record = EmailComplaint.objects.create(
-                email=email,
-                user=user,
-                complaint_type=complaint_type,
-                user_agent=user_agent,
-                sns_message_id=sns_message.get('MessageId', ''),
-                feedback_id=complaint.get('feedbackId', ''),
-                raw_notification=message,
-            )
-
-            logger.warning(f"Email complaint received: {email} ({complaint_type})")
-
-            # IMMEDIATELY add to suppression list (complaints are serious)
-            if not complaint_record.suppressed:
-                EmailSuppressionList.add_to_suppression(
-                    email=email,
-                    reason='complaint',
-                    complaint=complaint_record,
-                    notes=f"Auto-suppressed due to spam complaint ({complaint_type})"
-                )
-
-                # Mark complaint as suppressed
-                complaint_record.suppressed = True
-                complaint_record.save()
-
-                logger.critical(f"Email suppressed due to complaint: {email}")
+        # Record complaints and suppress complained addresses (queued when Celery is enabled)
+        response_data = dispatch_notification(sns_message.get('MessageId', ''), message)
 
-        return JsonResponse({
-            'status': 'success',
-            'processed': len(complained_recipients)
-        }, status=200)
+        return JsonResponse(response_data, status=200)
 
     except Exception as e:
         logger.error(f"Error processing complaint webhook: {str(e)}", exc_info=True)